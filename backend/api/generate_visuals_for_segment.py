@@ -5,6 +5,7 @@ from backend.models.asset import Asset
 from backend.models.project import Project
 from backend.llm.factory import create_llm_provider_from_env
 from backend.llm.image_factory import create_image_provider
+from backend.utils.text_formatter import extract_code_block
 
 from fastapi import Query
 router = APIRouter(prefix="/api/image", tags=["Image"])
@@ -35,9 +36,9 @@ async def _generate_visuals_for_segment_core(project, segment, narration_text, i
             messages=[{"role": "user", "content": prompt}],
             model=None, temperature=0.5, max_tokens=400
         )
-        import json, re
+        import json
         raw_content = response["content"] if isinstance(response, dict) else str(response)
-        cleaned_content = re.sub(r"^```(?:json)?\s*|\s*```$", "", raw_content.strip(), flags=re.IGNORECASE)
+        cleaned_content = extract_code_block(raw_content)
         parts = json.loads(cleaned_content)
         if not isinstance(parts, list):
             raise ValueError("LLM did not return a list")
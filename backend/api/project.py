@@ -393,7 +393,7 @@ async def create_visual(segment_id: int, visual_data: VisualCreate):
     if visual_data.image_data:
         visual.set_image_data(visual_data.image_data)
     
-    if visual.save(project_id):
+    if await visual.save_async(project_id):
         return {"success": True, "visual": visual.to_dict()}
     else:
         raise HTTPException(status_code=500, detail="Failed to create visual")
@@ -413,9 +413,9 @@ async def regenerate_section(request: RegenerateSectionRequest):
     """
     # You would import and use your script generator service here
     from backend.services.script_generator import ScriptGeneratorService
-    from backend.llm.base import get_llm_provider
+    from backend.llm.factory import create_llm_provider_from_env
 
-    llm_provider = get_llm_provider()
+    llm_provider = create_llm_provider_from_env()
     script_generator = ScriptGeneratorService(llm_provider)
 
     # Implement your regeneration logic here. This is a placeholder.
@@ -424,6 +424,7 @@ async def regenerate_section(request: RegenerateSectionRequest):
         section_id=request.sectionId,
         sections=request.sections,
         inspiration=request.inspiration,
+        prompt=request.prompt,
     )
     return {"regeneratedSection": regenerated_section}
 
@@ -485,7 +486,7 @@ async def update_visual(visual_id: int, visual_data: VisualUpdate):
     if visual_data.image_data:
         visual.set_image_data(visual_data.image_data)
     
-    if visual.save(project_id):
+    if await visual.save_async(project_id):
         return {"success": True, "visual": visual.to_dict()}
     else:
         raise HTTPException(status_code=500, detail="Failed to update visual")
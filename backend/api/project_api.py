@@ -435,7 +435,7 @@ async def create_visual(segment_id: int, visual_data: dict):
     # Set image data if provided
     if visual_data.get("image_data"):
         visual.set_image_data(visual_data["image_data"])
-    if visual.save(project_id):
+    if await visual.save_async(project_id):
         return {"success": True, "visual": visual.to_dict()}
     else:
         raise HTTPException(status_code=500, detail="Failed to create visual")
@@ -474,7 +474,7 @@ async def update_visual(visual_id: int, visual_data: dict):
     # Set image data if provided
     if visual_data.get("image_data"):
         visual.set_image_data(visual_data["image_data"])
-    if visual.save(project_id):
+    if await visual.save_async(project_id):
         return {"success": True, "visual": visual.to_dict()}
     else:
         raise HTTPException(status_code=500, detail="Failed to update visual")
@@ -73,7 +73,7 @@ async def parse_json_script(
             style=script_req.style,
             inspiration=script_req.inspiration,
             visual_style=script_req.visual_style,
-            sections=script_generator._create_sections(script_data["sections"]),
+            sections=script_generator._create_sections(script_data["sections"], visual_style=script_req.visual_style),
             created_at=datetime.now(),
             updated_at=datetime.now(),
             total_duration=script_data["total_duration"],
@@ -89,13 +89,16 @@ async def parse_json_script(
 @router.post("/generate", response_model=ScriptResponse)
 async def generate_script(
     request: ScriptRequest,
+    refresh: bool = False,
     script_generator: ScriptGeneratorService = Depends(get_script_generator)
 ):
     """
     Generate a script based on the request.
+
+    Pass refresh=true to skip the cached script for an identical request.
     """
     try:
-        script = await script_generator.generate_script(request)
+        script = await script_generator.generate_script(request, use_cache=not refresh)
         return ScriptResponse(script=script)
     except Exception as e:
         import traceback # Correct indentation
@@ -7,6 +7,7 @@ from backend.api.llm import get_llm_provider
 from typing import Dict, Any, Optional
 from pydantic import BaseModel
 from backend.models.project import Project
+from backend.utils.text_formatter import extract_code_block
 import json
 
 router = APIRouter(prefix="/api/social", tags=["Social Media"])
@@ -58,15 +59,10 @@ Highlights:
     ]
     llm_response = await llm_provider.generate_completion(messages, max_tokens=4000, temperature=0.7)
     content = llm_response["content"]
-    import re, logging
+    import logging
     # Remove code block markers and leading/trailing whitespace
     # Use the same robust extraction as InfocardHighlightGeneratorService
-    def extract_json_from_code_block(text: str) -> str:
-        match = re.search(r"```(?:json)?\s*([\s\S]*?)\s*```", text, re.IGNORECASE)
-        if match:
-            return match.group(1)
-        return text
-    cleaned_content = extract_json_from_code_block(content).strip()
+    cleaned_content = extract_code_block(content)
     try:
         posts = json.loads(cleaned_content)
     except Exception as e:
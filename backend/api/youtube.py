@@ -8,6 +8,7 @@ from fastapi import APIRouter, HTTPException, Body, Depends
 from pydantic import BaseModel
 from backend.llm.factory import create_llm_provider_from_env
 from backend.llm.base import LLMProvider
+from backend.utils.text_formatter import strip_code_fence
 
 router = APIRouter(prefix="/api/youtube", tags=["YouTube"])
 
@@ -59,11 +60,7 @@ async def generate_youtube_timestamps(
         max_tokens=300
     )
     # Remove markdown/code block if present
-    import re
-    raw = response["content"].strip()
-    codeblock_match = re.match(r"^```(?:[a-zA-Z]+)?\s*([\s\S]*?)\s*```$", raw)
-    if codeblock_match:
-        raw = codeblock_match.group(1).strip()
+    raw = strip_code_fence(response["content"])
     return YoutubeTimestampsResponse(timestamps=raw)
 
 @router.get("/project/{project_id}/word_timings", response_model=List[dict])
@@ -120,12 +117,9 @@ async def generate_youtube_title(
             temperature=0.7,
             max_tokens=500
         )
-        import json, re
-        raw = response["content"].strip()
+        import json
         # Remove markdown code block wrappers if present
-        codeblock_match = re.match(r"^```(?:json)?\s*([\s\S]*?)\s*```$", raw)
-        if codeblock_match:
-            raw = codeblock_match.group(1).strip()
+        raw = strip_code_fence(response["content"])
         try:
             titles = json.loads(raw)
             if not isinstance(titles, list):
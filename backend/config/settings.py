@@ -3,6 +3,7 @@ Application settings using Pydantic BaseSettings.
 Reads environment variables and provides typed settings.
 """
 import os
+from functools import lru_cache
 from pathlib import Path
 from dotenv import load_dotenv
 from pydantic_settings import BaseSettings
@@ -58,8 +59,13 @@ class Settings(BaseSettings):
         env_file_encoding = 'utf-8'
         extra = 'ignore' # Ignore extra env vars not defined in the model
 
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the shared Settings instance, reading the environment only once."""
+    return Settings()
+
 # Instantiate settings
-settings = Settings()
+settings = get_settings()
 
 # Ensure directories exist after settings are loaded
 # Use absolute paths for clarity if needed, otherwise relative to project root assumed
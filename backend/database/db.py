@@ -136,6 +136,43 @@ def execute_many(sql: str, params_list: List[Tuple]) -> bool:
         logger.error(f"SQL: {sql}")
         return False
 
+def execute_insert_many(sql: str, params_list: List[Tuple]) -> Optional[List[int]]:
+    """
+    Execute an INSERT statement for multiple parameter sets in one transaction.
+
+    Unlike execute_many, this returns the row id of each inserted row. If
+    any row fails, the whole transaction is rolled back.
+
+    Args:
+        sql: INSERT statement to execute
+        params_list: List of parameter tuples
+
+    Returns:
+        The inserted row ids, in order, or None if an error occurred
+    """
+    conn = None
+    try:
+        conn = get_db_connection()
+        cur = conn.cursor()
+        row_ids = []
+        # sqlite3 caches the prepared statement, so each row only binds parameters
+        for params in params_list:
+            cur.execute(sql, params)
+            row_ids.append(cur.lastrowid)
+        conn.commit()
+        cur.close()
+        return row_ids
+    except Exception as e:
+        # Insert all rows or none of them
+        if conn is not None:
+            conn.rollback()
+        logger.error(f"Error executing statement: {str(e)}")
+        logger.error(f"SQL: {sql}")
+        return None
+    finally:
+        if conn is not None:
+            conn.close()
+
 # Initialize the database if this module is run directly
 if __name__ == "__main__":
     init_db()
@@ -0,0 +1,20 @@
+-- Migration: Add 'visuals' table used by the Visual model
+CREATE TABLE IF NOT EXISTS visuals (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    segment_id INTEGER NOT NULL,
+    description TEXT,
+    timestamp REAL,
+    duration REAL,
+    image_path TEXT,
+    alt_text TEXT,
+    visual_type TEXT,
+    visual_style TEXT,
+    position INTEGER,
+    zoom_level REAL,
+    transition TEXT,
+    remove_background BOOLEAN DEFAULT 0,
+    remove_background_method TEXT DEFAULT 'color',
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_visuals_segment_id ON visuals(segment_id);
@@ -42,7 +42,28 @@ CREATE TABLE IF NOT EXISTS settings (
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Visuals table for the images shown during a segment
+CREATE TABLE IF NOT EXISTS visuals (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    segment_id INTEGER NOT NULL,
+    description TEXT,
+    timestamp REAL,
+    duration REAL,
+    image_path TEXT,           -- Relative path to the image file
+    alt_text TEXT,
+    visual_type TEXT,
+    visual_style TEXT,
+    position INTEGER,
+    zoom_level REAL,
+    transition TEXT,
+    remove_background BOOLEAN DEFAULT 0,
+    remove_background_method TEXT DEFAULT 'color',
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
 -- Indexes for better performance
 CREATE INDEX IF NOT EXISTS idx_assets_project_id ON assets(project_id);
 CREATE INDEX IF NOT EXISTS idx_assets_type ON assets(asset_type);
 CREATE INDEX IF NOT EXISTS idx_settings_key ON settings(key);
+CREATE INDEX IF NOT EXISTS idx_visuals_segment_id ON visuals(segment_id);
@@ -14,6 +14,7 @@ class LLMProvider(ABC):
                                  model: Optional[str] = None,
                                  temperature: float = 0.7,
                                  max_tokens: Optional[int] = None,
+                                 json_mode: bool = False,
                                  **kwargs) -> Dict[str, Any]:
         """
         Generate a completion from the LLM.
@@ -23,6 +24,8 @@ class LLMProvider(ABC):
             model: Optional model override (defaults to configured model)
             temperature: Controls randomness (0-1)
             max_tokens: Maximum tokens to generate
+            json_mode: Constrain the output to a single JSON object, without
+                markdown fences or prose (the prompt must still ask for JSON)
             **kwargs: Additional provider-specific parameters
 
         Returns:
@@ -36,6 +39,7 @@ class LLMProvider(ABC):
                                        model: Optional[str] = None,
                                        temperature: float = 0.7,
                                        max_tokens: Optional[int] = None,
+                                       json_mode: bool = False,
                                        **kwargs) -> AsyncGenerator[Dict[str, Any], None]:
         """
         Generate a streaming completion from the LLM.
@@ -45,9 +49,12 @@ class LLMProvider(ABC):
             model: Optional model override (defaults to configured model)
             temperature: Controls randomness (0-1)
             max_tokens: Maximum tokens to generate
+            json_mode: Constrain the output to a single JSON object, without
+                markdown fences or prose (the prompt must still ask for JSON)
             **kwargs: Additional provider-specific parameters
 
         Returns:
-            AsyncGenerator yielding dictionaries containing partial responses
+            AsyncGenerator yielding dictionaries with each 'content_delta'; only
+            the final chunk ('finished' set) carries the complete 'content'
         """
         pass
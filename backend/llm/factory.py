@@ -2,12 +2,13 @@
 Factory for creating LLM providers based on configuration.
 """
 import os
+from functools import lru_cache
 from typing import Optional
 
 from .base import LLMProvider
 from .openai_provider import OpenAIProvider
 from .google_provider import GoogleProvider
-from backend.config.settings import Settings
+from backend.config.settings import get_settings
 
 
 def create_llm_provider(
@@ -44,6 +45,23 @@ def create_llm_provider(
         raise ValueError(f"Unsupported LLM provider: {provider}")
 
 
+@lru_cache(maxsize=8)
+def _get_shared_llm_provider(
+    provider: str,
+    api_key: str,
+    model: str,
+    api_url: Optional[str] = None
+) -> LLMProvider:
+    """
+    Return one provider instance per configuration.
+    
+    Reusing the provider reuses its API client, so requests share pooled
+    keep-alive connections instead of opening a new TCP+TLS connection
+    for every call.
+    """
+    return create_llm_provider(provider, api_key, model, api_url)
+
+
 def create_llm_provider_from_env() -> LLMProvider:
     """
     Create an LLM provider based on environment variables.
@@ -55,12 +73,12 @@ def create_llm_provider_from_env() -> LLMProvider:
     - LLM_API_URL: Optional API URL for the provider (required for deepseek and ollama)
     
     Returns:
-        An instance of the appropriate LLM provider
+        The shared instance of the appropriate LLM provider
         
     Raises:
         ValueError: If required environment variables are missing
     """
-    settings = Settings()
+    settings = get_settings()
     
     provider = settings.llm_api_provider
     api_key = settings.llm_api_key
@@ -78,4 +96,4 @@ def create_llm_provider_from_env() -> LLMProvider:
     if provider.lower() in ["deepseek", "ollama"] and not api_url:
         raise ValueError(f"LLM_API_URL environment variable is required for {provider}")
     
-    return create_llm_provider(provider, api_key, model, api_url)
+    return _get_shared_llm_provider(provider, api_key, model, api_url)
@@ -38,6 +38,7 @@ class GoogleProvider(LLMProvider):
                                  model: Optional[str] = None,
                                  temperature: float = 0.7,
                                  max_tokens: Optional[int] = None,
+                                 json_mode: bool = False,
                                  **kwargs) -> Dict[str, Any]:
         """
         Generate a completion using the Google Gemini API.
@@ -47,6 +48,8 @@ class GoogleProvider(LLMProvider):
             model: Optional model override (defaults to configured model)
             temperature: Controls randomness (0-1)
             max_tokens: Maximum tokens to generate
+            json_mode: Constrain the output to a single JSON object, without
+                markdown fences or prose (the prompt must still ask for JSON)
             **kwargs: Additional Gemini-specific parameters
 
         Returns:
@@ -55,10 +58,12 @@ class GoogleProvider(LLMProvider):
         # Convert messages to Google's new format
         contents = self._convert_messages_to_contents(messages)
 
-        # Set up generation config
+        # Set up generation config, passing system messages as the system instruction
         config = types.GenerateContentConfig(
             temperature=temperature,
             max_output_tokens=max_tokens,
+            system_instruction=self._extract_system_instruction(messages),
+            response_mime_type="application/json" if json_mode else None,
             **kwargs
         )
 
@@ -85,6 +90,7 @@ class GoogleProvider(LLMProvider):
                                        model: Optional[str] = None,
                                        temperature: float = 0.7,
                                        max_tokens: Optional[int] = None,
+                                       json_mode: bool = False,
                                        **kwargs) -> AsyncGenerator[Dict[str, Any], None]:
         """
         Generate a streaming completion using the Google Gemini API.
@@ -94,6 +100,8 @@ class GoogleProvider(LLMProvider):
             model: Optional model override (defaults to configured model)
             temperature: Controls randomness (0-1)
             max_tokens: Maximum tokens to generate
+            json_mode: Constrain the output to a single JSON object, without
+                markdown fences or prose (the prompt must still ask for JSON)
             **kwargs: Additional Gemini-specific parameters
 
         Yields:
@@ -102,10 +110,12 @@ class GoogleProvider(LLMProvider):
         # Convert messages to Google's new format
         contents = self._convert_messages_to_contents(messages)
 
-        # Set up generation config
+        # Set up generation config, passing system messages as the system instruction
         config = types.GenerateContentConfig(
             temperature=temperature,
             max_output_tokens=max_tokens,
+            system_instruction=self._extract_system_instruction(messages),
+            response_mime_type="application/json" if json_mode else None,
             **kwargs
         )
 
@@ -115,7 +125,7 @@ class GoogleProvider(LLMProvider):
         # Generate streaming content
         stream = await self._generate_content_stream_async(model_name, contents, config)
 
-        full_content = ""
+        content_parts = []
 
         async for chunk in stream:
             # Skip chunks without text
@@ -124,13 +134,11 @@ class GoogleProvider(LLMProvider):
 
             # Extract the content delta
             content_delta = chunk.text
-            full_content += content_delta
-
-            # Format the content
-            formatted_content = format_llm_response(full_content)
+            content_parts.append(content_delta)
 
+            # Partial chunks carry only the delta; the accumulated content is
+            # formatted once, in the final chunk
             yield {
-                "content": formatted_content,
                 "content_delta": content_delta,
                 "role": "assistant",
                 "model": model_name,
@@ -139,13 +147,26 @@ class GoogleProvider(LLMProvider):
 
         # Final yield with the complete content
         yield {
-            "content": format_llm_response(full_content),
+            "content": format_llm_response("".join(content_parts)),
             "content_delta": "",
             "role": "assistant",
             "model": model_name,
             "finished": True
         }
 
+    def _extract_system_instruction(self, messages: List[Dict[str, str]]) -> Optional[str]:
+        """
+        Combine the system messages into a single Gemini system instruction.
+
+        Args:
+            messages: List of message dictionaries with 'role' and 'content' keys
+
+        Returns:
+            The system instruction text, or None if there are no system messages
+        """
+        system_parts = [message["content"] for message in messages if message["role"] == "system"]
+        return "\n\n".join(system_parts) if system_parts else None
+
     def _convert_messages_to_contents(self, messages: List[Dict[str, str]]) -> List[types.Content]:
         """
         Convert OpenAI-style messages to Google Gemini content format.
@@ -163,8 +184,7 @@ class GoogleProvider(LLMProvider):
             content = message["content"]
 
             if role == "system":
-                # System messages are handled as system instructions in the config
-                # We'll handle this separately in the generate methods
+                # System messages are passed as the system instruction in the config
                 continue
             elif role == "user":
                 # User messages
@@ -201,24 +221,12 @@ class GoogleProvider(LLMProvider):
         Returns:
             Response from the Gemini API
         """
-        # Generate content
-        # The new Gemini API might not be fully async, so we need to handle it properly
-        try:
-            # Try to use it as an awaitable
-            response = await self.client.models.generate_content(
-                model=model_name,
-                contents=contents,
-                config=config
-            )
-            return response
-        except TypeError:
-            # If it's not awaitable, use it directly
-            response = self.client.models.generate_content(
-                model=model_name,
-                contents=contents,
-                config=config
-            )
-            return response
+        # Use the async client; the synchronous client would block the event loop
+        return await self.client.aio.models.generate_content(
+            model=model_name,
+            contents=contents,
+            config=config
+        )
 
     async def _generate_content_stream_async(self, model_name: str, contents: List[types.Content],
                                            config: types.GenerateContentConfig) -> AsyncGenerator:
@@ -233,23 +241,10 @@ class GoogleProvider(LLMProvider):
         Returns:
             Streaming response from the Gemini API
         """
-        # Generate streaming content
-        # The new Gemini API might not be fully async, so we need to handle it properly
-        try:
-            # Try to use it as an awaitable
-            stream = await self.client.models.generate_content(
-                model=model_name,
-                contents=contents,
-                config=config,
-                stream=True
-            )
-            return stream
-        except TypeError:
-            # If it's not awaitable, use it directly
-            stream = self.client.models.generate_content(
-                model=model_name,
-                contents=contents,
-                config=config,
-                stream=True
-            )
-            return stream
+        # Stream through the async client; generate_content does not accept
+        # a stream flag in the google-genai SDK
+        return await self.client.aio.models.generate_content_stream(
+            model=model_name,
+            contents=contents,
+            config=config
+        )
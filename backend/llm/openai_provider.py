@@ -33,6 +33,7 @@ class OpenAIProvider(LLMProvider):
                                  model: Optional[str] = None,
                                  temperature: float = 0.7,
                                  max_tokens: Optional[int] = None,
+                                 json_mode: bool = False,
                                  **kwargs) -> Dict[str, Any]:
         """
         Generate a completion using the OpenAI API.
@@ -42,11 +43,15 @@ class OpenAIProvider(LLMProvider):
             model: Optional model override (defaults to configured model)
             temperature: Controls randomness (0-1)
             max_tokens: Maximum tokens to generate
+            json_mode: Constrain the output to a single JSON object, without
+                markdown fences or prose (the prompt must still ask for JSON)
             **kwargs: Additional OpenAI-specific parameters
 
         Returns:
             Dictionary containing the response
         """
+        if json_mode:
+            kwargs["response_format"] = {"type": "json_object"}
         response = await self.client.chat.completions.create(
             model=model or self.default_model,
             messages=messages,
@@ -73,6 +78,7 @@ class OpenAIProvider(LLMProvider):
                                        model: Optional[str] = None,
                                        temperature: float = 0.7,
                                        max_tokens: Optional[int] = None,
+                                       json_mode: bool = False,
                                        **kwargs) -> AsyncGenerator[Dict[str, Any], None]:
         """
         Generate a streaming completion using the OpenAI API.
@@ -82,11 +88,15 @@ class OpenAIProvider(LLMProvider):
             model: Optional model override (defaults to configured model)
             temperature: Controls randomness (0-1)
             max_tokens: Maximum tokens to generate
+            json_mode: Constrain the output to a single JSON object, without
+                markdown fences or prose (the prompt must still ask for JSON)
             **kwargs: Additional OpenAI-specific parameters
 
         Yields:
             Dictionaries containing partial responses
         """
+        if json_mode:
+            kwargs["response_format"] = {"type": "json_object"}
         stream = await self.client.chat.completions.create(
             model=model or self.default_model,
             messages=messages,
@@ -96,7 +106,7 @@ class OpenAIProvider(LLMProvider):
             **kwargs
         )
 
-        full_content = ""
+        content_parts = []
         model_name = ""
 
         async for chunk in stream:
@@ -116,13 +126,11 @@ class OpenAIProvider(LLMProvider):
 
             # Append to the full content
             content_delta = delta.content
-            full_content += content_delta
-
-            # Format the content for better readability
-            formatted_content = format_llm_response(full_content)
+            content_parts.append(content_delta)
 
+            # Partial chunks carry only the delta; the accumulated content is
+            # formatted once, in the final chunk
             yield {
-                "content": formatted_content,
                 "content_delta": content_delta,
                 "role": "assistant",
                 "model": model_name or model or self.default_model,
@@ -131,7 +139,7 @@ class OpenAIProvider(LLMProvider):
 
         # Final yield with the complete content
         yield {
-            "content": format_llm_response(full_content),
+            "content": format_llm_response("".join(content_parts)),
             "content_delta": "",
             "role": "assistant",
             "model": model_name or model or self.default_model,
@@ -1,38 +1,43 @@
 """
 Section model for the video generation project.
 """
+from dataclasses import dataclass, field
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 
 from backend.database.db import query, execute
 
+@dataclass(slots=True)
 class Section:
-    """Section model class."""
+    """
+    Section model class.
+
+    Attributes:
+        id: Section ID (None for new sections)
+        project_id: ID of the parent project
+        title: Section title
+        content: Section content
+        total_duration: Total duration in seconds
+        position: Position in the project
+        created_at: Creation timestamp
+        updated_at: Last update timestamp
+    """
     
-    def __init__(self, id: Optional[int] = None, project_id: int = 0, title: str = "", 
-                 content: str = "", total_duration: float = 0.0, position: int = 0,
-                 created_at: Optional[datetime] = None, updated_at: Optional[datetime] = None):
-        """
-        Initialize a Section instance.
-        
-        Args:
-            id: Section ID (None for new sections)
-            project_id: ID of the parent project
-            title: Section title
-            content: Section content
-            total_duration: Total duration in seconds
-            position: Position in the project
-            created_at: Creation timestamp
-            updated_at: Last update timestamp
-        """
-        self.id = id
-        self.project_id = project_id
-        self.title = title
-        self.content = content
-        self.total_duration = total_duration
-        self.position = position
-        self.created_at = created_at or datetime.now()
-        self.updated_at = updated_at or datetime.now()
+    id: Optional[int] = None
+    project_id: int = 0
+    title: str = ""
+    content: str = ""
+    total_duration: float = 0.0
+    position: int = 0
+    created_at: Optional[datetime] = field(default_factory=datetime.now)
+    updated_at: Optional[datetime] = field(default_factory=datetime.now)
+    
+    def __post_init__(self):
+        # Database rows may pass explicit None timestamps
+        if self.created_at is None:
+            self.created_at = datetime.now()
+        if self.updated_at is None:
+            self.updated_at = datetime.now()
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Section':
@@ -1,38 +1,43 @@
 """
 Segment model for the video generation project.
 """
+from dataclasses import dataclass, field
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 
 from backend.database.db import query, execute
 
+@dataclass(slots=True)
 class Segment:
-    """Segment model class."""
+    """
+    Segment model class.
+
+    Attributes:
+        id: Segment ID (None for new segments)
+        section_id: ID of the parent section
+        narration_text: Narration text
+        start_time: Start time in seconds
+        duration: Duration in seconds
+        position: Position in the section
+        created_at: Creation timestamp
+        updated_at: Last update timestamp
+    """
     
-    def __init__(self, id: Optional[int] = None, section_id: int = 0, narration_text: str = "", 
-                 start_time: float = 0.0, duration: float = 0.0, position: int = 0,
-                 created_at: Optional[datetime] = None, updated_at: Optional[datetime] = None):
-        """
-        Initialize a Segment instance.
-        
-        Args:
-            id: Segment ID (None for new segments)
-            section_id: ID of the parent section
-            narration_text: Narration text
-            start_time: Start time in seconds
-            duration: Duration in seconds
-            position: Position in the section
-            created_at: Creation timestamp
-            updated_at: Last update timestamp
-        """
-        self.id = id
-        self.section_id = section_id
-        self.narration_text = narration_text
-        self.start_time = start_time
-        self.duration = duration
-        self.position = position
-        self.created_at = created_at or datetime.now()
-        self.updated_at = updated_at or datetime.now()
+    id: Optional[int] = None
+    section_id: int = 0
+    narration_text: str = ""
+    start_time: float = 0.0
+    duration: float = 0.0
+    position: int = 0
+    created_at: Optional[datetime] = field(default_factory=datetime.now)
+    updated_at: Optional[datetime] = field(default_factory=datetime.now)
+    
+    def __post_init__(self):
+        # Database rows may pass explicit None timestamps
+        if self.created_at is None:
+            self.created_at = datetime.now()
+        if self.updated_at is None:
+            self.updated_at = datetime.now()
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Segment':
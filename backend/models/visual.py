@@ -1,60 +1,77 @@
 """
 Visual model for the video generation project.
 """
-from typing import List, Dict, Any, Optional
+import asyncio
+import mimetypes
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 
-from backend.database.db import query, execute
-from backend.utils.file_storage import save_base64_image, load_image_as_base64, delete_file
+from backend.database.db import query, execute, execute_many, execute_insert_many
+from backend.utils.file_storage import save_base64_image, load_image_as_base64, load_image_bytes, delete_file
 
+# Columns read by Visual.from_dict
+_COLUMNS = ("id, segment_id, description, timestamp, duration, image_path, alt_text, visual_type, "
+            "visual_style, position, zoom_level, transition, created_at, updated_at, "
+            "remove_background, remove_background_method")
+
+_INSERT_SQL = """
+    INSERT INTO visuals (segment_id, description, timestamp, duration, image_path,
+                        alt_text, visual_type, visual_style, position, zoom_level, transition, remove_background, remove_background_method)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+@dataclass(slots=True)
 class Visual:
-    """Visual model class."""
-    
-    def __init__(self, id: Optional[int] = None, segment_id: int = 0, description: str = "", 
-                 timestamp: float = 0.0, duration: float = 0.0, image_path: Optional[str] = None,
-                 alt_text: str = "", visual_type: str = "image", visual_style: str = "",
-                 position: int = 0, zoom_level: float = 1.0, transition: str = "",
-                 created_at: Optional[datetime] = None, updated_at: Optional[datetime] = None, remove_background: bool = False, remove_background_method: str = 'color'):
-        """
-        Initialize a Visual instance.
+    """
+    Visual model class.
 
-        Args:
-            id: Visual ID (None for new visuals)
-            segment_id: ID of the parent segment
-            description: Visual description
-            timestamp: Timestamp in seconds
-            duration: Duration in seconds
-            image_path: Path to the image file
-            alt_text: Alternative text
-            visual_type: Type of visual (image, video, etc.)
-            visual_style: Style of the visual
-            position: Position in the segment
-            zoom_level: Zoom level
-            transition: Transition effect
-            created_at: Creation timestamp
-            updated_at: Last update timestamp
-            remove_background: Whether to remove the background
-            remove_background_method: Method to use for removing the background
-        """
-        self.id = id
-        self.segment_id = segment_id
-        self.description = description
-        self.timestamp = timestamp
-        self.duration = duration
-        self.image_path = image_path
-        self.alt_text = alt_text
-        self.visual_type = visual_type
-        self.visual_style = visual_style
-        self.position = position
-        self.zoom_level = zoom_level
-        self.transition = transition
-        self.created_at = created_at or datetime.now()
-        self.updated_at = updated_at or datetime.now()
-        self.remove_background = remove_background
-        self.remove_background_method = remove_background_method
-        
-        # Temporary storage for base64 image data
-        self._image_data = None
+    Attributes:
+        id: Visual ID (None for new visuals)
+        segment_id: ID of the parent segment
+        description: Visual description
+        timestamp: Timestamp in seconds
+        duration: Duration in seconds
+        image_path: Path to the image file
+        alt_text: Alternative text
+        visual_type: Type of visual (image, video, etc.)
+        visual_style: Style of the visual
+        position: Position in the segment
+        zoom_level: Zoom level
+        transition: Transition effect
+        created_at: Creation timestamp
+        updated_at: Last update timestamp
+        remove_background: Whether to remove the background
+        remove_background_method: Method to use for removing the background
+    """
+    
+    id: Optional[int] = None
+    segment_id: int = 0
+    description: str = ""
+    timestamp: float = 0.0
+    duration: float = 0.0
+    image_path: Optional[str] = None
+    alt_text: str = ""
+    visual_type: str = "image"
+    visual_style: str = ""
+    position: int = 0
+    zoom_level: float = 1.0
+    transition: str = ""
+    created_at: Optional[datetime] = field(default_factory=datetime.now)
+    updated_at: Optional[datetime] = field(default_factory=datetime.now)
+    remove_background: bool = False
+    remove_background_method: str = 'color'
+    
+    # Temporary storage for base64 image data
+    _image_data: Optional[str] = field(default=None, init=False, repr=False)
+    
+    def __post_init__(self):
+        # Database rows and request payloads may pass explicit None timestamps
+        if self.created_at is None:
+            self.created_at = datetime.now()
+        if self.updated_at is None:
+            self.updated_at = datetime.now()
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Visual':
@@ -134,6 +151,29 @@ class Visual:
         """
         self._image_data = base64_data
     
+    def open_image_bytes(self) -> Optional[Tuple[str, bytes]]:
+        """
+        Load the raw image bytes for this visual without base64 encoding.
+        
+        Use this when passing the image to an API that accepts binary data.
+        
+        Returns:
+            Tuple of (content_type, image_bytes), or None if there is no image
+        """
+        if not self.image_path:
+            return None
+        success, image_data = load_image_bytes(self.image_path)
+        if not success:
+            return None
+        content_type = mimetypes.guess_type(self.image_path)[0] or "image/png"
+        return content_type, image_data
+    
+    def _insert_params(self) -> tuple:
+        """Return the parameters for _INSERT_SQL."""
+        return (self.segment_id, self.description, self.timestamp, self.duration, self.image_path,
+                self.alt_text, self.visual_type, self.visual_style, self.position, self.zoom_level,
+                self.transition, self.remove_background, self.remove_background_method)
+    
     def save(self, project_id: int = None) -> bool:
         """
         Save the visual to the database.
@@ -144,37 +184,35 @@ class Visual:
         Returns:
             True if successful, False otherwise
         """
-        # Save the image if we have base64 data
-        if self._image_data and project_id is not None:
-            # For new visuals, we need to save with a temporary ID first
-            temp_id = self.id or 0
-            success, file_path = save_base64_image(self._image_data, project_id, temp_id)
-            if success:
+        if self.id is None:
+            # Insert new visual first so the image can be saved under its real ID
+            self.id = execute(_INSERT_SQL, self._insert_params())
+            if self.id is None:
+                return False
+            
+            # Save the image if we have base64 data, then record its path
+            if self._image_data and project_id is not None:
+                success, file_path = save_base64_image(self._image_data, project_id, self.id)
+                update_sql = "UPDATE visuals SET image_path = ? WHERE id = ?"
+                if not success or execute(update_sql, (file_path, self.id)) is None:
+                    # Do not leave a row behind for a visual whose image was not saved
+                    if success:
+                        delete_file(file_path)
+                    execute("DELETE FROM visuals WHERE id = ?", (self.id,))
+                    self.id = None
+                    return False
                 self.image_path = file_path
                 self._image_data = None
-        
-        if self.id is None:
-            # Insert new visual
-            sql = """
-                INSERT INTO visuals (segment_id, description, timestamp, duration, image_path,
-                                    alt_text, visual_type, visual_style, position, zoom_level, transition, remove_background, remove_background_method)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """
-            params = (self.segment_id, self.description, self.timestamp, self.duration, self.image_path,
-                     self.alt_text, self.visual_type, self.visual_style, self.position, self.zoom_level, self.transition, self.remove_background, self.remove_background_method)
-            self.id = execute(sql, params)
             
-            # If we have a new ID and we saved a temporary image, rename it
-            if self.id is not None and self.image_path and project_id is not None and "0.png" in self.image_path:
-                success, new_path = save_base64_image(self._image_data, project_id, self.id)
+            return True
+        else:
+            # Save the image if we have base64 data
+            if self._image_data and project_id is not None:
+                success, file_path = save_base64_image(self._image_data, project_id, self.id)
                 if success:
-                    self.image_path = new_path
-                    # Update the image path in the database
-                    update_sql = "UPDATE visuals SET image_path = ? WHERE id = ?"
-                    execute(update_sql, (self.image_path, self.id))
+                    self.image_path = file_path
+                    self._image_data = None
             
-            return self.id is not None
-        else:
             # Update existing visual
             self.updated_at = datetime.now()
             sql = """
@@ -189,6 +227,65 @@ class Visual:
                      self.transition, self.updated_at, self.remove_background, self.remove_background_method, self.id)
             return execute(sql, params) is not None
     
+    @classmethod
+    def save_many(cls, visuals: List['Visual'], project_id: int = None) -> bool:
+        """
+        Insert several new visuals in a single transaction.
+        
+        Images are written afterwards in a thread pool, and their paths are
+        recorded with one batched UPDATE.
+        
+        Args:
+            visuals: New visuals (without IDs) to insert
+            project_id: The ID of the project (required for visuals with image data)
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        if not visuals:
+            return True
+        if any(visual.id is not None for visual in visuals):
+            raise ValueError("save_many only inserts new visuals")
+        
+        row_ids = execute_insert_many(_INSERT_SQL, [visual._insert_params() for visual in visuals])
+        if row_ids is None:
+            return False
+        for visual, row_id in zip(visuals, row_ids):
+            visual.id = row_id
+        
+        with_images = [visual for visual in visuals if visual._image_data and project_id is not None]
+        if not with_images:
+            return True
+        
+        with ThreadPoolExecutor() as executor:
+            results = list(executor.map(
+                lambda visual: save_base64_image(visual._image_data, project_id, visual.id),
+                with_images
+            ))
+        
+        updates = []
+        for visual, (success, file_path) in zip(with_images, results):
+            if success:
+                visual.image_path = file_path
+                visual._image_data = None
+                updates.append((file_path, visual.id))
+        
+        return execute_many("UPDATE visuals SET image_path = ? WHERE id = ?", updates)
+    
+    async def save_async(self, project_id: int = None) -> bool:
+        """
+        Save the visual to the database without blocking the event loop.
+        
+        The blocking database and image I/O in save() runs in a worker thread.
+        
+        Args:
+            project_id: The ID of the project (required for new visuals with image data)
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        return await asyncio.to_thread(self.save, project_id)
+    
     @classmethod
     def get_by_id(cls, visual_id: int, include_image_data: bool = False) -> Optional['Visual']:
         """
@@ -201,7 +298,7 @@ class Visual:
         Returns:
             A Visual instance or None if not found
         """
-        sql = "SELECT * FROM visuals WHERE id = ?"
+        sql = f"SELECT {_COLUMNS} FROM visuals WHERE id = ?"
         result = query(sql, (visual_id,), one=True)
         
         if result:
@@ -228,7 +325,7 @@ class Visual:
         Returns:
             A list of Visual instances
         """
-        sql = "SELECT * FROM visuals WHERE segment_id = ? ORDER BY position"
+        sql = f"SELECT {_COLUMNS} FROM visuals WHERE segment_id = ? ORDER BY position"
         results = query(sql, (segment_id,))
         
         visuals = []
@@ -4,18 +4,18 @@ Script to run the FastAPI server.
 import os
 import sys
 import uvicorn
-from config.settings import Settings
 
 
 # Add the parent directory to the path so we can import the backend package
 parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, parent_dir)
 
-# Import settings after path is set up
-settings = Settings()
-
 
 if __name__ == "__main__":
+    # Import settings after path is set up
+    from config.settings import get_settings
+    settings = get_settings()
+
     uvicorn.run(
         "backend.app.main:app",
         host=settings.api_host,
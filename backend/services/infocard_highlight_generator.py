@@ -1,5 +1,9 @@
 from typing import List, Dict, Any
 
+import orjson
+
+from backend.utils.text_formatter import extract_code_block
+
 class InfocardHighlightGeneratorService:
     def __init__(self, llm_provider):
         self.llm_provider = llm_provider
@@ -28,16 +32,9 @@ class InfocardHighlightGeneratorService:
             messages, model=model, temperature=temperature, max_tokens=1200
         )
         content = llm_response["content"]
-        import json
-        import re
-        def extract_json_from_code_block(text: str) -> str:
-            match = re.search(r"```(?:json)?\s*([\s\S]*?)\s*```", text, re.IGNORECASE)
-            if match:
-                return match.group(1)
-            return text
-        cleaned_content = extract_json_from_code_block(content).strip()
+        cleaned_content = extract_code_block(content)
         try:
-            highlights = json.loads(cleaned_content)
+            highlights = orjson.loads(cleaned_content)
             for idx, h in enumerate(highlights):
                 h["index"] = idx + 1
         except Exception as e:
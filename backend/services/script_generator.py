@@ -1,13 +1,716 @@
 """
 Script generation service.
 """
-import json
+import asyncio
+import copy
+import hashlib
+import logging
+import re
+import threading
 import uuid
+import weakref
+from collections import OrderedDict
 from datetime import datetime
-from typing import Dict, Any, List
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, AsyncGenerator, Dict, Any, List, Optional
+
+import diskcache
+import fastjsonschema
+import orjson
 
 from ..llm.base import LLMProvider
-from ..models.script import Script, ScriptSection, ScriptSegment, Visual, ScriptRequest
+
+if TYPE_CHECKING:
+    # Models are imported lazily inside the methods that build them
+    from ..models.script import Script, ScriptSection, ScriptRequest
+
+logger = logging.getLogger(__name__)
+
+# Fallback values for visual fields missing from the parsed script data
+_VISUAL_DEFAULTS = {
+    "description": "",
+    "timestamp": 0,
+    "duration": 5,
+    "visual_type": "image",
+    "visual_style": None,
+    "position": "center",
+    "transition": "fade",
+}
+
+# Fields every generated visual is normalized to, whatever the LLM returned.
+# Shared template applied with a single dict.update; treat as read-only.
+_NORMALIZED_VISUAL_FIELDS = {
+    "timestamp": 0.0,
+    "duration": 2.0,
+    "visual_type": "image",
+    "zoom_level": 1.0,
+    "position": "center",
+    "text_span": "",
+    "transition": "fade",
+}
+
+_SYSTEM_PROMPT = "You are an expert scriptwriter for educational videos."
+
+# Static instructions and response schema shared by every script generation request
+_PROMPT_SCHEMA_BLOCK = """
+        **Instructions:**
+        1. Structure the script into logical sections (e.g., Introduction, Key Point 1, Key Point 2, Example, Conclusion).
+        2. Divide each section into multiple short, focused segments. Each segment represents a few sentences of narration.
+        3. **For EACH segment, generate AT LEAST THREE distinct visual suggestions.**
+        4. **For EACH visual, you MUST ensure it is tightly aligned with the narration text at the visual's timestamp:**
+           - If a segment has multiple visuals, break down the narration text so that each visual matches the exact part being spoken at its timestamp.
+           - The visual's description MUST be contextually and temporally relevant—do NOT use generic illustrations. The visual should clearly reflect what is being narrated at that moment.
+           - Optionally, for each visual, include a `text_span` or short excerpt from the narration text that is being visualized at that timestamp.
+        5. For each visual, also provide:
+           - Timestamp: When the visual should appear within the segment (relative to the segment's start time, in seconds).
+           - Duration: How long the visual should be displayed (in seconds).
+           - Visual type (image, animation, diagram, or text)
+           - Position (left, right, center, full)
+           - Transition (fade, slide, zoom, none)
+        6. VERY IMPORTANT: Provide at least 15 segments for each section
+        
+        Format your response as a JSON object with the following structure:
+        {
+            "title": "Title of the video",
+            "description": "Brief description of the video",
+            "total_duration": total_duration_in_seconds,
+            "sections": [
+                {
+                    "title": "Section title",
+                    "content": "Overview of the section",
+                    "total_duration": section_duration_in_seconds,
+                    "segments": [
+                        {
+                            "narration_text": "Text to be narrated",
+                            "start_time": start_time_in_seconds,
+                            "duration": duration_in_seconds,
+                            "visuals": [
+                                {
+                                    "description": "Description for image generation, directly reflecting the narration text (MINIMALISTIC VISUAL).",
+                                }
+                            ]
+                        }
+                    ]
+                }
+            ]
+        }
+        
+        **Important:** Make sure the script is engaging, educational, and appropriate for the target audience. Ensure the total duration is respected, segment timings are sequential, and visual timestamps/durations fit within their parent segment. The visual descriptions are critical – make them specific and evocative. Generate AT LEAST TWO visuals per segment.
+        """
+
+# The request-independent part of the conversation is sent first, so providers
+# with prefix caching (OpenAI automatic caching, Gemini implicit caching) can
+# reuse it across requests; only the request-specific prompt follows it.
+_SCRIPT_SYSTEM_PROMPT = _SYSTEM_PROMPT + "\n" + _PROMPT_SCHEMA_BLOCK
+
+# Request-specific part of the script generation prompt, filled in by
+# _build_script_generation_prompt
+_SCRIPT_PROMPT_TEMPLATE = """
+        Create a detailed script for an educational video about \"{topic}\".
+
+        Instead of addressing a general audience, write the script as if you are speaking directly to a single person, making it personal and conversational. Use 'you' and 'your' to address the viewer, and make the tone friendly and engaging.
+        Target audience: {target_audience}
+        Approximate duration: {duration_minutes} minutes (Meaning each section should contain about {section_minutes} minutes of content or 15 segments)
+        Style: {style} and slightly humorous
+        {inspiration_text}
+        """
+
+# Added to the script generation prompt when the request has an inspiration
+_INSPIRATION_PROMPT_TEMPLATE = "\n\n**Inspiration:** {inspiration}\nUse this inspiration as the main creative or thematic driver for the script. Make sure the script reflects this inspiration throughout, in both content and tone.\n"
+
+# Response schema shared by the prompts that produce a single section
+_SECTION_SCHEMA_BLOCK = """
+        Return your result as a JSON object with the following structure:
+        {
+            "title": "Section title",
+            "content": "Overview of the section",
+            "total_duration": section_duration_in_seconds,
+            "segments": [
+                {
+                    "narration_text": "Text to be narrated",
+                    "start_time": start_time_in_seconds,
+                    "duration": duration_in_seconds,
+                    "visuals": [
+                        {
+                            "description": "Description for image generation, directly reflecting the narration text (MINIMALISTIC VISUAL).",
+                            "timestamp": timestamp_in_seconds,
+                            "duration": duration_in_seconds,
+                            "visual_type": "image|animation|diagram|text",
+                            "visual_style": "Style guidance (optional)",
+                            "position": "left|right|center|full",
+                            "text_span": "Text span for text visuals (optional)",
+                            "transition": "fade|slide|zoom|none"
+                        }
+                    ]
+                }
+            ]
+        }
+        """
+
+# Static instructions and response schema for regenerating a single section,
+# sent as the system message ahead of the request-specific context
+_SECTION_SYSTEM_PROMPT = _SYSTEM_PROMPT + """
+        Your job is to regenerate a specific section of a script, ensuring it fits contextually with the rest of the script and is inspired by the given inspiration.
+
+        Regenerate the section so it fits seamlessly with the rest of the script. Be creative, ensure the style and tone match the context and inspiration, and preserve any important structure or information.
+        """ + _SECTION_SCHEMA_BLOCK
+
+# Request-specific part of the section regeneration prompt
+_SECTION_PROMPT_TEMPLATE = """
+        Inspiration: {inspiration}
+
+        Other Sections Context:
+        {context}
+
+        ---
+
+        Section to Regenerate ({section_id}):
+        Title: {title}
+        Content: {content}
+
+        User Prompt: {prompt}
+        """
+
+# Static instructions for planning a script's sections before they are
+# written in parallel
+_OUTLINE_SYSTEM_PROMPT = _SYSTEM_PROMPT + """
+        Your job is to plan the outline of a script, without writing its narration yet.
+        Structure the script into logical sections (e.g., Introduction, Key Point 1, Key Point 2, Example, Conclusion) and split the duration between them.
+
+        Format your response as a JSON object with the following structure:
+        {
+            "title": "Title of the video",
+            "description": "Brief description of the video",
+            "total_duration": total_duration_in_seconds,
+            "sections": [
+                {
+                    "title": "Section title",
+                    "content": "Overview of the section",
+                    "total_duration": section_duration_in_seconds
+                }
+            ]
+        }
+        """
+
+# Outline section fields kept over the written section's own
+_OUTLINE_SECTION_FIELDS = ("title", "content", "total_duration")
+
+# Static instructions for writing one section of a planned outline
+_SECTION_WRITER_SYSTEM_PROMPT = _SYSTEM_PROMPT + """
+        Your job is to write one section of a script from the script's outline, so it fits seamlessly with the sections around it.
+        1. Divide the section into multiple short, focused segments. Each segment represents a few sentences of narration.
+        2. **For EACH segment, generate AT LEAST THREE distinct visual suggestions**, each tightly aligned with the part of the narration being spoken at its timestamp.
+        3. Make sure segment timings are sequential and fit within the section duration.
+        """ + _SECTION_SCHEMA_BLOCK
+
+# Output budget of one section call, scaled by the section duration: about
+# 3 narration tokens per second plus visual descriptions and JSON structure.
+# The floor leaves headroom for short sections; the cap keeps durations from
+# the LLM's outline within every provider's output limit.
+_SECTION_TOKENS_PER_SECOND = 8
+_SECTION_MIN_TOKENS = 2048
+_SECTION_MAX_TOKENS = 8192
+
+# Request-specific part of the section writing prompt
+_SECTION_WRITER_PROMPT_TEMPLATE = """
+        Video: {video}
+
+        Outline:
+        {outline}
+
+        ---
+
+        Section to Write:
+        Title: {title}
+        Content: {content}
+        Duration: {duration} seconds
+        """
+
+# Lead-in for prompts that request several scripts in one LLM call
+_BATCH_PROMPT_HEADER = """
+        Write a separate script for each of the {count} videos described below.
+        Format your response as a JSON array containing one script object per video, in the same order as the videos, each following the structure described above.
+        """
+
+# Shape of the script data requested in _PROMPT_SCHEMA_BLOCK. Only the
+# structure later code relies on is required; missing timings and visual
+# fields are filled in by _normalize_script_data.
+_SCRIPT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "title": {"type": "string"},
+        "description": {"type": "string"},
+        "total_duration": {"type": "number"},
+        "sections": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "title": {"type": "string"},
+                    "content": {"type": "string"},
+                    "segments": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "narration_text": {"type": "string"},
+                                "visuals": {
+                                    "type": "array",
+                                    "items": {"type": "object"},
+                                },
+                            },
+                        },
+                    },
+                },
+                "required": ["segments"],
+            },
+        },
+    },
+    "required": ["sections"],
+}
+
+# Compiled once at import; raises fastjsonschema.JsonSchemaException naming
+# the failing path when the data does not match _SCRIPT_SCHEMA
+_validate_script_data = fastjsonschema.compile(_SCRIPT_SCHEMA)
+_validate_section_data = fastjsonschema.compile(_SCRIPT_SCHEMA["properties"]["sections"]["items"])
+
+# Rough ceiling on the request-specific prompt size of one batched call,
+# estimated at four characters per token
+_BATCH_PROMPT_TOKEN_BUDGET = 4000
+
+# Parsed script data from earlier LLM calls, keyed by _script_request_key (or
+# _section_request_key for regenerated sections) and kept in
+# least-recently-used order. Entries are treated as read-only.
+_SCRIPT_DATA_CACHE_SIZE = 128
+_script_data_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+# Persistent copy of the script data cache that survives restarts, bounded
+# by size with least-recently-used eviction. Opened on first use. Values are
+# stored as zlib-compressed JSON; scripts repeat the same keys and enum values
+# on every segment, so even the fastest compression level shrinks them a lot.
+_SCRIPT_DISK_CACHE_DIR = Path(__file__).resolve().parent.parent / "storage" / "cache" / "scripts-json"
+_SCRIPT_DISK_CACHE_COMPRESS_LEVEL = 1
+# Bumped when the request key changes, so entries stored under keys that
+# no longer mean the same request are never served
+_SCRIPT_CACHE_KEY_VERSION = 2
+_SCRIPT_DISK_CACHE_SIZE_LIMIT = 2 ** 30
+_SCRIPT_DISK_CACHE_EXPIRE = 7 * 24 * 60 * 60
+_script_disk_cache: Optional[diskcache.Cache] = None
+# Guards opening the cache, which now happens from worker threads
+_script_disk_cache_lock = threading.Lock()
+
+# One lock per request key being generated, see _script_request_lock
+_script_request_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+
+def _get_script_disk_cache() -> diskcache.Cache:
+    """Return the persistent script data cache, opening it on first use."""
+    global _script_disk_cache
+    with _script_disk_cache_lock:
+        if _script_disk_cache is None:
+            _script_disk_cache = diskcache.Cache(
+                directory=str(_SCRIPT_DISK_CACHE_DIR),
+                disk=diskcache.JSONDisk,
+                disk_compress_level=_SCRIPT_DISK_CACHE_COMPRESS_LEVEL,
+                size_limit=_SCRIPT_DISK_CACHE_SIZE_LIMIT,
+                eviction_policy="least-recently-used"
+            )
+    return _script_disk_cache
+
+
+# Filler words that do not change what a video covers ("Intro to X",
+# "Introduction to X" and "X" produce near-identical scripts)
+_TOPIC_FILLER_WORDS = frozenset({
+    "a", "an", "the", "to", "of", "on", "about", "into",
+    "intro", "introduction", "introducing", "overview",
+    "understanding", "basics", "explained",
+})
+# A topic word, keeping the dots inside names like "Node.js" and trailing
+# "+"/"#" so "C", "C++" and "C#" stay distinct
+_TOPIC_WORD_RE = re.compile(r"[^\W_](?:[\w.]*[^\W_])?[+#]*")
+
+
+def _canonical_topic(topic: str) -> str:
+    """
+    Reduce a topic to its significant words so paraphrases share a cache key.
+    
+    Args:
+        topic: The requested video topic
+        
+    Returns:
+        The lowercased topic words without filler words or punctuation
+        other than the symbols that are part of a name
+    """
+    words = _TOPIC_WORD_RE.findall(topic.casefold())
+    significant = [word for word in words if word not in _TOPIC_FILLER_WORDS]
+    # A topic made only of filler words is kept as written
+    return " ".join(significant or words)
+
+
+def _script_request_key(request: "ScriptRequest") -> str:
+    """
+    Build a cache key from the fields that shape the prompt.
+    
+    The topic is canonicalized, so requests that differ only in case,
+    punctuation or filler words share a key. The visual style is not part
+    of the prompt; it is applied when the script is built, so requests
+    that differ only in visual style share the cached script data too.
+    
+    Args:
+        request: The script generation request
+        
+    Returns:
+        A hex digest identifying the request
+    """
+    payload = orjson.dumps({
+        "version": _SCRIPT_CACHE_KEY_VERSION,
+        "topic": _canonical_topic(request.topic),
+        "target_audience": request.target_audience,
+        "duration_minutes": request.duration_minutes,
+        "style": request.style,
+        "inspiration": request.inspiration,
+    }, option=orjson.OPT_SORT_KEYS)
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+def _section_request_key(llm_provider: LLMProvider, regen_prompt: str, temperature: float) -> str:
+    """
+    Build a cache key for a section regeneration call.
+    
+    Section keys share the script data caches, so they are prefixed to
+    keep them apart from _script_request_key digests.
+    
+    Args:
+        llm_provider: Provider the section is regenerated with
+        regen_prompt: Request-specific section regeneration prompt
+        temperature: Sampling temperature of the call
+        
+    Returns:
+        A prefixed hex digest identifying the call
+    """
+    payload = orjson.dumps([
+        type(llm_provider).__name__,
+        getattr(llm_provider, "default_model", None),
+        temperature,
+        _SECTION_SYSTEM_PROMPT,
+        regen_prompt,
+    ])
+    return "section-" + hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+async def _get_cached_script_data(cache_key: str) -> Optional[Dict[str, Any]]:
+    """Return cached script data for a request key, marking it recently used."""
+    script_data = _script_data_cache.get(cache_key)
+    if script_data is not None:
+        _script_data_cache.move_to_end(cache_key)
+        return script_data
+    
+    # Fall back to the persistent cache, reading it in a worker thread so
+    # the event loop is not blocked, and keep the hit in memory
+    script_data = await asyncio.to_thread(_read_persisted_script_data, cache_key)
+    if script_data is not None:
+        _remember_script_data(cache_key, script_data)
+    return script_data
+
+
+def _remember_script_data(cache_key: str, script_data: Dict[str, Any]) -> None:
+    """Add script data to the in-memory cache, evicting the least recently used entry."""
+    _script_data_cache[cache_key] = script_data
+    if len(_script_data_cache) > _SCRIPT_DATA_CACHE_SIZE:
+        _script_data_cache.popitem(last=False)
+
+
+async def _cache_script_data(cache_key: str, script_data: Optional[Dict[str, Any]]) -> None:
+    """Cache successfully parsed script data in memory and on disk."""
+    if script_data is None:
+        return
+    _remember_script_data(cache_key, script_data)
+    await asyncio.to_thread(_write_persisted_script_data, cache_key, script_data)
+
+
+def _read_persisted_script_data(cache_key: str) -> Optional[Dict[str, Any]]:
+    """Read script data from the persistent cache (blocking)."""
+    return _get_script_disk_cache().get(cache_key)
+
+
+def _write_persisted_script_data(cache_key: str, script_data: Dict[str, Any]) -> None:
+    """Write script data to the persistent cache (blocking)."""
+    _get_script_disk_cache().set(cache_key, script_data, expire=_SCRIPT_DISK_CACHE_EXPIRE)
+
+
+def _script_request_lock(cache_key: str) -> asyncio.Lock:
+    """
+    Return the lock that serializes generation for one request key.
+    
+    Concurrent identical requests wait for the first one and then read its
+    result from the cache, instead of each calling the LLM. Locks are
+    dropped once no request holds a reference to them.
+    """
+    lock = _script_request_locks.get(cache_key)
+    if lock is None:
+        lock = asyncio.Lock()
+        _script_request_locks[cache_key] = lock
+    return lock
+
+
+@lru_cache(maxsize=256)
+def _build_script_generation_prompt(
+    topic: str,
+    target_audience: str,
+    duration_minutes: float,
+    style: str,
+    inspiration: Optional[str]
+) -> str:
+    """
+    Fill in the script generation prompt for the given request fields.
+    
+    Memoized, since batching and retries build the same prompt several
+    times for one request.
+    
+    Args:
+        topic: Topic of the video
+        target_audience: Target audience of the video
+        duration_minutes: Approximate duration in minutes
+        style: Style of the script
+        inspiration: Optional inspiration for the script
+        
+    Returns:
+        The request-specific prompt
+    """
+    inspiration_text = _INSPIRATION_PROMPT_TEMPLATE.format(inspiration=inspiration) if inspiration else ""
+    return _SCRIPT_PROMPT_TEMPLATE.format(
+        topic=topic,
+        target_audience=target_audience,
+        duration_minutes=duration_minutes,
+        section_minutes=duration_minutes / 60,
+        style=style,
+        inspiration_text=inspiration_text
+    )
+
+
+# A complete JSON string literal, written as an unrolled loop so runs of
+# ordinary characters are matched without backtracking
+_JSON_STRING_PATTERN = r'"[^"\\]*(?:\\.[^"\\]*)*"'
+
+# Characters that end a JSON string or escape the character after them
+_JSON_STRING_SPECIAL_RE = re.compile(r'["\\]')
+
+
+class _JsonObjectScanner:
+    """
+    Incrementally locate the first complete JSON object in streamed text.
+    
+    Braces inside JSON strings are ignored, and any text after the object
+    closes is left out. Pass '[' and ']' to locate a JSON array instead.
+    """
+
+    def __init__(self, opener: str = '{', closer: str = '}'):
+        self._opener = opener
+        self._closer = closer
+        # Outside strings only brackets and quotes matter, so the regex engine
+        # skips everything else and consumes each complete string whole; a
+        # lone quote opens a string that continues in a later chunk
+        self._structural_re = re.compile(
+            _JSON_STRING_PATTERN + f'|["{re.escape(opener)}{re.escape(closer)}]',
+            re.DOTALL
+        )
+        self._parts: List[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._done = False
+
+    def feed(self, chunk: str) -> Optional[str]:
+        """
+        Scan the next chunk of text.
+        
+        Args:
+            chunk: The next piece of the text
+            
+        Returns:
+            The complete JSON object text once it has closed, otherwise None
+        """
+        if self._done or not chunk:
+            return None
+        pos = 0
+        if self._depth == 0:
+            # Skip any leading text before the object opens
+            pos = chunk.find(self._opener)
+            if pos == -1:
+                return None
+        start = pos
+        if self._escaped:
+            # The previous chunk ended with a backslash inside a string
+            self._escaped = False
+            pos += 1
+        string_special = _JSON_STRING_SPECIAL_RE.search
+        structural = self._structural_re.search
+        end = len(chunk)
+        while True:
+            if self._in_string:
+                match = string_special(chunk, pos)
+                if match is None:
+                    break
+                pos = match.end()
+                if match.group() == '\\':
+                    if pos == end:
+                        self._escaped = True
+                        break
+                    pos += 1
+                else:
+                    self._in_string = False
+            else:
+                match = structural(chunk, pos)
+                if match is None:
+                    break
+                pos = match.end()
+                c = match.group()
+                if c[0] == '"':
+                    # A lone quote starts a string the chunk does not finish
+                    self._in_string = len(c) == 1
+                elif c == self._opener:
+                    self._depth += 1
+                else:
+                    self._depth -= 1
+                    if self._depth == 0:
+                        self._done = True
+                        self._parts.append(chunk[start:pos])
+                        return "".join(self._parts)
+        self._parts.append(chunk[start:])
+        return None
+
+
+# Any JSON token that changes nesting or string state, with complete
+# strings consumed whole as in _JsonObjectScanner
+_JSON_SECTION_TOKEN_RE = re.compile(_JSON_STRING_PATTERN + r'|["{}\[\]]', re.DOTALL)
+
+
+class _JsonSectionScanner:
+    """
+    Incrementally collect the section objects of a streamed script.
+    
+    Relies on the requested script structure, where "sections" is the only
+    array directly inside the root object, so every object two levels below
+    the root is a section.
+    """
+
+    _SECTION_DEPTH = 3
+
+    def __init__(self):
+        self._parts: Optional[List[str]] = None
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._done = False
+
+    def feed(self, chunk: str) -> List[str]:
+        """
+        Scan the next chunk of text.
+        
+        Args:
+            chunk: The next piece of the script text
+            
+        Returns:
+            The text of every section object that closed in this chunk
+        """
+        sections = []
+        if self._done or not chunk:
+            return sections
+        pos = 0
+        if self._depth == 0:
+            # Skip any leading text before the root object opens
+            pos = chunk.find('{')
+            if pos == -1:
+                return sections
+        start = pos
+        if self._escaped:
+            # The previous chunk ended with a backslash inside a string
+            self._escaped = False
+            pos += 1
+        string_special = _JSON_STRING_SPECIAL_RE.search
+        token = _JSON_SECTION_TOKEN_RE.search
+        end = len(chunk)
+        while True:
+            if self._in_string:
+                match = string_special(chunk, pos)
+                if match is None:
+                    break
+                pos = match.end()
+                if match.group() == '\\':
+                    if pos == end:
+                        self._escaped = True
+                        break
+                    pos += 1
+                else:
+                    self._in_string = False
+                continue
+            match = token(chunk, pos)
+            if match is None:
+                break
+            pos = match.end()
+            c = match.group()
+            if c[0] == '"':
+                # A lone quote starts a string the chunk does not finish
+                self._in_string = len(c) == 1
+            elif c == '{' or c == '[':
+                self._depth += 1
+                if self._depth == self._SECTION_DEPTH and c == '{':
+                    self._parts = []
+                    start = match.start()
+            else:
+                self._depth -= 1
+                if self._depth == self._SECTION_DEPTH - 1 and self._parts is not None:
+                    self._parts.append(chunk[start:pos])
+                    sections.append("".join(self._parts))
+                    self._parts = None
+                elif self._depth == 0:
+                    self._done = True
+                    break
+        if self._parts is not None:
+            self._parts.append(chunk[start:])
+        return sections
+
+
+def _extract_json_object(text: str) -> Optional[str]:
+    """
+    Extract the first complete JSON object from text in a single pass.
+    
+    Args:
+        text: Text that may contain a JSON object
+        
+    Returns:
+        The JSON object substring, or None if no complete object is found
+    """
+    return _JsonObjectScanner().feed(text)
+
+
+def _load_json_object(text: str) -> Any:
+    """
+    Decode the first JSON object in an LLM response.
+    
+    Args:
+        text: The LLM response, possibly with text around the object
+        
+    Returns:
+        The decoded JSON object
+        
+    Raises:
+        ValueError: If the response contains no valid JSON object
+    """
+    if text.startswith('{'):
+        # Fast path: the response is the bare JSON object, so let orjson
+        # parse it directly without scanning for its boundaries first
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass
+    
+    # Extract JSON from the response (in case the LLM added extra text)
+    json_str = _extract_json_object(text)
+    if json_str is None:
+        raise ValueError("No JSON found in response")
+    return orjson.loads(json_str)
 
 
 class ScriptGeneratorService:
@@ -16,121 +719,470 @@ class ScriptGeneratorService:
     def __init__(self, llm_provider: LLMProvider):
         self.llm_provider = llm_provider
 
-    async def generate_script(self, request: ScriptRequest) -> Script:
+    async def generate_script(self, request: "ScriptRequest", use_cache: bool = True) -> "Script":
         """
         Generate a complete script based on the request.
         
         Args:
             request: The script generation request
+            use_cache: Reuse the script generated for an identical earlier
+                request; when False, a fresh script is generated and replaces
+                the cached one
             
         Returns:
             A complete script
         """
-        # Create the prompt for the LLM
-        prompt = self._create_script_generation_prompt(request)
-        print("---------------------------")
-        print("---------------------------")
-        print("---------------------------")
-        print("Prompt:", prompt)
+        # Reuse the parsed script data for an identical earlier request;
+        # identical requests in flight wait for the first one to finish
+        cache_key = _script_request_key(request)
+        async with _script_request_lock(cache_key):
+            script_data = await _get_cached_script_data(cache_key) if use_cache else None
+            if script_data is None:
+                script_data = await self._generate_script_data(request)
+                await _cache_script_data(cache_key, script_data)
         
-        # Generate the script structure using the LLM
-        response = await self.llm_provider.generate_completion(
+        return self._build_script(script_data, request)
+
+    async def generate_scripts(self, requests: List["ScriptRequest"], max_batch_size: int = 3) -> List[Optional["Script"]]:
+        """
+        Generate several scripts, packing uncached requests into shared LLM calls.
+        
+        The static instructions are sent once per call rather than once per
+        script. Any script missing from a batched response is generated on
+        its own.
+        
+        Args:
+            requests: The script generation requests
+            max_batch_size: Maximum number of scripts requested in one LLM call
+            
+        Returns:
+            The scripts, in the same order as the requests, with None for
+            any script whose response could not be parsed
+        """
+        cache_keys = [_script_request_key(request) for request in requests]
+        script_data_list = [await _get_cached_script_data(cache_key) for cache_key in cache_keys]
+        pending = [i for i, script_data in enumerate(script_data_list) if script_data is None]
+        
+        for batch in self._batch_requests([requests[i] for i in pending], max_batch_size):
+            batch_indices, pending = pending[:len(batch)], pending[len(batch):]
+            if len(batch) == 1:
+                batch_data = [await self._generate_script_data(batch[0])]
+            else:
+                batch_data = await self._generate_batch_script_data(batch)
+            for index, script_data in zip(batch_indices, batch_data):
+                if script_data is None and len(batch) > 1:
+                    # Retry on its own; a single request was already sent alone
+                    script_data = await self._generate_script_data(requests[index])
+                if script_data is None:
+                    logger.warning("Could not generate script %d of the batch (topic %r)", index + 1, requests[index].topic)
+                await _cache_script_data(cache_keys[index], script_data)
+                script_data_list[index] = script_data
+        
+        return [
+            self._build_script(script_data, request) if script_data is not None else None
+            for script_data, request in zip(script_data_list, requests)
+        ]
+
+    async def generate_scripts_concurrent(self, requests: List["ScriptRequest"], max_parallel: int = 5) -> List["Script"]:
+        """
+        Generate several scripts independently, running up to max_parallel at once.
+        
+        Unlike generate_scripts, every script gets its own LLM call, which
+        saves wall-clock time rather than tokens.
+        
+        Args:
+            requests: The script generation requests
+            max_parallel: Maximum number of concurrent LLM calls, to stay
+                within the provider's rate limit
+            
+        Returns:
+            The scripts, in the same order as the requests
+        """
+        semaphore = asyncio.Semaphore(max_parallel)
+        
+        async def generate_one(request: "ScriptRequest") -> "Script":
+            async with semaphore:
+                return await self.generate_script(request)
+        
+        return await asyncio.gather(*(generate_one(request) for request in requests))
+
+    async def stream_script_sections(self, request: "ScriptRequest") -> AsyncGenerator["ScriptSection", None]:
+        """
+        Generate a script, yielding each section as soon as the LLM finishes writing it.
+        
+        Downstream work such as narration or image generation can start on
+        the first section while later ones are still being generated. The
+        complete script data is cached once the response ends, so a later
+        generate_script call for the same request reuses it.
+        
+        Args:
+            request: The script generation request
+            
+        Yields:
+            The script sections, in order
+        """
+        cache_key = _script_request_key(request)
+        script_data = await _get_cached_script_data(cache_key)
+        if script_data is not None:
+            for section in self._create_sections(script_data["sections"], visual_style=request.visual_style):
+                yield section
+            return
+        
+        object_scanner = _JsonObjectScanner()
+        section_scanner = _JsonSectionScanner()
+        response_parts = []
+        json_str = None
+        section_number = 1
+        stream = self.llm_provider.generate_completion_stream(
             messages=[
-                {"role": "system", "content": "You are an expert scriptwriter for educational videos."},
-                {"role": "user", "content": prompt}
+                {"role": "system", "content": _SCRIPT_SYSTEM_PROMPT},
+                {"role": "user", "content": self._create_script_generation_prompt(request)}
             ],
-            temperature=0.7
+            temperature=0.7,
+            json_mode=True
         )
+        try:
+            async for chunk in stream:
+                content_delta = chunk["content_delta"]
+                response_parts.append(content_delta)
+                for section_json in section_scanner.feed(content_delta):
+                    try:
+                        section_data = orjson.loads(section_json)
+                        _validate_section_data(section_data)
+                    except (orjson.JSONDecodeError, fastjsonschema.JsonSchemaException):
+                        logger.exception("Error parsing streamed section %d", section_number)
+                        continue
+                    self._normalize_section_data(section_data)
+                    yield self._create_sections([section_data], section_number, request.visual_style)[0]
+                    section_number += 1
+                json_str = object_scanner.feed(content_delta)
+                if json_str is not None:
+                    # Anything after the object is not needed
+                    break
+        finally:
+            await stream.aclose()
         
-        # Parse the response into a script
-        script_data = self._parse_llm_response(response["content"], request)
+        await _cache_script_data(cache_key, self._parse_llm_response(json_str or "".join(response_parts), request))
+
+    async def generate_script_by_sections(self, request: "ScriptRequest", max_parallel: int = 5) -> Optional["Script"]:
+        """
+        Generate a script by planning its outline, then writing all sections concurrently.
+        
+        Each section is written by its own, shorter LLM call, so the
+        sections are decoded in parallel instead of one after another.
+        
+        Args:
+            request: The script generation request
+            max_parallel: Maximum number of concurrent section calls, to
+                stay within the provider's rate limit
+            
+        Returns:
+            A complete script, or None if the outline or a section could not
+            be parsed
+        """
+        scripts = await self.generate_scripts_by_sections([request], max_parallel)
+        return scripts[0]
+
+    async def generate_scripts_by_sections(self, requests: List["ScriptRequest"], max_parallel: int = 5) -> List[Optional["Script"]]:
+        """
+        Generate several scripts section by section, sharing one pool of LLM calls.
+        
+        The outlines of all uncached scripts are planned together, then the
+        sections of every script are written concurrently. A single limit
+        applies to all outline and section calls, so several scripts do not
+        multiply the load on the provider.
+        
+        Args:
+            requests: The script generation requests
+            max_parallel: Maximum number of concurrent LLM calls across all
+                scripts, to stay within the provider's rate limit
+            
+        Returns:
+            The scripts, in the same order as the requests, with None for
+            any script whose outline or sections could not be parsed
+        """
+        # Reuse the parsed script data for identical earlier requests
+        cache_keys = [_script_request_key(request) for request in requests]
+        script_data_list = [await _get_cached_script_data(cache_key) for cache_key in cache_keys]
+        pending = [i for i, script_data in enumerate(script_data_list) if script_data is None]
+        
+        semaphore = asyncio.Semaphore(max_parallel)
+        generated = await asyncio.gather(*(
+            self._generate_sectioned_script_data(requests[i], semaphore) for i in pending
+        ))
+        for index, script_data in zip(pending, generated):
+            if script_data is None:
+                logger.warning("Could not generate script %d by sections (topic %r)", index + 1, requests[index].topic)
+            await _cache_script_data(cache_keys[index], script_data)
+            script_data_list[index] = script_data
         
-        # Create the script object
+        return [
+            self._build_script(script_data, request) if script_data is not None else None
+            for script_data, request in zip(script_data_list, requests)
+        ]
+
+    def _build_script(self, script_data: Dict[str, Any], request: "ScriptRequest") -> "Script":
+        """
+        Create a script object from parsed script data.
+        
+        Args:
+            script_data: Parsed script data
+            request: The script generation request
+            
+        Returns:
+            A complete script with a fresh ID and timestamps
+        """
+        from ..models.script import Script
+        
+        # Create the script object; a new script was created and last updated
+        # at the same instant
+        now = datetime.now()
         script = Script(
-            id=f"script-{uuid.uuid4()}",
+            id=f"script-{uuid.uuid4().hex}",
             title=script_data["title"],
             description=script_data["description"],
             target_audience=request.target_audience,
             style=request.style,
             inspiration=request.inspiration,
             visual_style=request.visual_style,
-            sections=self._create_sections(script_data["sections"]),
-            created_at=datetime.now(),
-            updated_at=datetime.now(),
+            sections=self._create_sections(script_data["sections"], visual_style=request.visual_style),
+            created_at=now,
+            updated_at=now,
             total_duration=script_data["total_duration"],
             status="draft"
         )
         
         return script
 
-    def _create_script_generation_prompt(self, request: ScriptRequest) -> str:
+    def _batch_requests(self, requests: List["ScriptRequest"], max_batch_size: int) -> List[List["ScriptRequest"]]:
+        """
+        Split requests into batches that fit the batch size and prompt budget.
+        
+        Args:
+            requests: The script generation requests
+            max_batch_size: Maximum number of requests per batch
+            
+        Returns:
+            The requests grouped into batches, in order
+        """
+        batches = []
+        batch = []
+        batch_tokens = 0
+        for request in requests:
+            prompt_tokens = len(self._create_script_generation_prompt(request)) // 4
+            if batch and (len(batch) >= max_batch_size or batch_tokens + prompt_tokens > _BATCH_PROMPT_TOKEN_BUDGET):
+                batches.append(batch)
+                batch = []
+                batch_tokens = 0
+            batch.append(request)
+            batch_tokens += prompt_tokens
+        if batch:
+            batches.append(batch)
+        return batches
+
+    async def _generate_batch_script_data(self, requests: List["ScriptRequest"]) -> List[Optional[Dict[str, Any]]]:
         """
-        Create a prompt for generating a script.
+        Ask the LLM for several scripts in one call and parse its response.
+        
+        Args:
+            requests: The script generation requests in the batch
+            
+        Returns:
+            Script data for each request, or None where it could not be parsed
+        """
+        prompt = _BATCH_PROMPT_HEADER.format(count=len(requests)) + "".join(
+            f"\n        Video {n}:{self._create_script_generation_prompt(request)}"
+            for n, request in enumerate(requests, 1)
+        )
+        
+        response = await self.llm_provider.generate_completion(
+            messages=[
+                {"role": "system", "content": _SCRIPT_SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.7
+        )
+        
+        items = []
+        json_str = _JsonObjectScanner('[', ']').feed(response["content"])
+        if json_str is not None:
+            try:
+                items = orjson.loads(json_str)
+            except orjson.JSONDecodeError as e:
+                logger.warning("Error parsing batched LLM response: %s", e)
+        
+        results = []
+        for i, request in enumerate(requests):
+            script_data = items[i] if i < len(items) and isinstance(items[i], dict) else None
+            if script_data is not None:
+                try:
+                    script_data = self._normalize_script_data(script_data, request)
+                except fastjsonschema.JsonSchemaException as e:
+                    logger.warning("Error parsing batched script %d: %s", i + 1, e)
+                    script_data = None
+            results.append(script_data)
+        return results
+
+    async def _generate_script_data(self, request: "ScriptRequest") -> Dict[str, Any]:
+        """
+        Stream a script from the LLM and parse its response.
         
         Args:
             request: The script generation request
             
         Returns:
-            A prompt for the LLM
+            A dictionary with script data, or None if parsing failed
         """
-        print("Creating script generation prompt")
-        print(request)
-        inspiration_text = f"\n\n**Inspiration:** {request.inspiration}\nUse this inspiration as the main creative or thematic driver for the script. Make sure the script reflects this inspiration throughout, in both content and tone.\n" if hasattr(request, 'inspiration') and getattr(request, 'inspiration', None) else ""
-        return f"""
-        Create a detailed script for an educational video about \"{request.topic}\".
+        # Create the prompt for the LLM
+        prompt = self._create_script_generation_prompt(request)
+        logger.debug("Script generation prompt: %s", prompt)
+        
+        # Stream the script from the LLM, locating the JSON object while the
+        # rest of the response is still arriving
+        scanner = _JsonObjectScanner()
+        response_parts = []
+        json_str = None
+        stream = self.llm_provider.generate_completion_stream(
+            messages=[
+                {"role": "system", "content": _SCRIPT_SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.7,
+            json_mode=True
+        )
+        try:
+            async for chunk in stream:
+                content_delta = chunk["content_delta"]
+                response_parts.append(content_delta)
+                json_str = scanner.feed(content_delta)
+                if json_str is not None:
+                    # Anything after the object is not needed
+                    break
+        finally:
+            await stream.aclose()
+        
+        # Parse the response into a script
+        return self._parse_llm_response(json_str or "".join(response_parts), request)
 
-        Instead of addressing a general audience, write the script as if you are speaking directly to a single person, making it personal and conversational. Use 'you' and 'your' to address the viewer, and make the tone friendly and engaging.
-        Target audience: {request.target_audience}
-        Approximate duration: {request.duration_minutes} minutes (Meaning each section should contain about {request.duration_minutes / 60} minutes of content or 15 segments)
-        Style: {request.style} and slightly humorous
-        {inspiration_text}
+    async def _generate_sectioned_script_data(self, request: "ScriptRequest", semaphore: asyncio.Semaphore) -> Dict[str, Any]:
+        """
+        Generate script data from an outline whose sections are written concurrently.
         
-        **Instructions:**
-        1. Structure the script into logical sections (e.g., Introduction, Key Point 1, Key Point 2, Example, Conclusion).
-        2. Divide each section into multiple short, focused segments. Each segment represents a few sentences of narration.
-        3. **For EACH segment, generate AT LEAST THREE distinct visual suggestions.**
-        4. **For EACH visual, you MUST ensure it is tightly aligned with the narration text at the visual's timestamp:**
-           - If a segment has multiple visuals, break down the narration text so that each visual matches the exact part being spoken at its timestamp.
-           - The visual's description MUST be contextually and temporally relevant—do NOT use generic illustrations. The visual should clearly reflect what is being narrated at that moment.
-           - Optionally, for each visual, include a `text_span` or short excerpt from the narration text that is being visualized at that timestamp.
-        5. For each visual, also provide:
-           - Timestamp: When the visual should appear within the segment (relative to the segment's start time, in seconds).
-           - Duration: How long the visual should be displayed (in seconds).
-           - Visual type (image, animation, diagram, or text)
-           - Position (left, right, center, full)
-           - Transition (fade, slide, zoom, none)
-        6. VERY IMPORTANT: Provide at least 15 segments for each section
+        Args:
+            request: The script generation request
+            semaphore: Limits the number of concurrent LLM calls
+            
+        Returns:
+            A dictionary with script data, or None if any response could not be parsed
+        """
+        video_prompt = self._create_script_generation_prompt(request)
+        async with semaphore:
+            response = await self.llm_provider.generate_completion(
+                messages=[
+                    {"role": "system", "content": _OUTLINE_SYSTEM_PROMPT},
+                    {"role": "user", "content": video_prompt}
+                ],
+                temperature=0.7,
+                json_mode=True
+            )
+        try:
+            outline = _load_json_object(response["content"])
+            outline_sections = outline["sections"]
+            if not isinstance(outline_sections, list) or not all(isinstance(section, dict) for section in outline_sections):
+                raise ValueError("Outline sections must be a list of objects")
+        except (ValueError, KeyError) as e:
+            logger.warning("Error parsing script outline: %s", e)
+            return None
         
-        Format your response as a JSON object with the following structure:
-        {{
-            "title": "Title of the video",
-            "description": "Brief description of the video",
-            "total_duration": total_duration_in_seconds,
-            "sections": [
-                {{
-                    "title": "Section title",
-                    "content": "Overview of the section",
-                    "total_duration": section_duration_in_seconds,
-                    "segments": [
-                        {{
-                            "narration_text": "Text to be narrated",
-                            "start_time": start_time_in_seconds,
-                            "duration": duration_in_seconds,
-                            "visuals": [
-                                {{
-                                    "description": "Description for image generation, directly reflecting the narration text (MINIMALISTIC VISUAL).",
-                                }}
-                            ]
-                        }}
-                    ]
-                }}
-            ]
-        }}
+        outline_text = "\n        ".join(
+            f"{n}. {section.get('title', '')}: {section.get('content', '')}"
+            for n, section in enumerate(outline_sections, 1)
+        )
+        # Start every section call before awaiting any of them; the
+        # semaphore queues the calls beyond its limit
+        async def generate_section(section: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+            async with semaphore:
+                return await self._generate_section_data(video_prompt, outline_text, section)
         
-        **Important:** Make sure the script is engaging, educational, and appropriate for the target audience. Ensure the total duration is respected, segment timings are sequential, and visual timestamps/durations fit within their parent segment. The visual descriptions are critical – make them specific and evocative. Generate AT LEAST TWO visuals per segment.
+        tasks = [asyncio.create_task(generate_section(section)) for section in outline_sections]
+        sections = await asyncio.gather(*tasks)
+        if any(section is None for section in sections):
+            return None
+        
+        script_data = {**outline, "sections": sections}
+        try:
+            return self._normalize_script_data(script_data, request)
+        except fastjsonschema.JsonSchemaException as e:
+            logger.warning("Error parsing sectioned script: %s", e)
+            return None
+
+    async def _generate_section_data(self, video_prompt: str, outline_text: str, outline_section: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Write the segments of one outlined section.
+        
+        Args:
+            video_prompt: The request-specific script generation prompt
+            outline_text: The numbered list of all outlined sections
+            outline_section: The outline entry of the section to write
+            
+        Returns:
+            The section data, or None if the response could not be parsed
+        """
+        duration = outline_section.get('total_duration', 60)
+        if not isinstance(duration, (int, float)):
+            duration = 60
+        prompt = _SECTION_WRITER_PROMPT_TEMPLATE.format(
+            video=video_prompt,
+            outline=outline_text,
+            title=outline_section.get('title', ''),
+            content=outline_section.get('content', ''),
+            duration=duration
+        )
+        response = await self.llm_provider.generate_completion(
+            messages=[
+                {"role": "system", "content": _SECTION_WRITER_SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.7,
+            max_tokens=min(_SECTION_MAX_TOKENS, max(_SECTION_MIN_TOKENS, int(duration * _SECTION_TOKENS_PER_SECOND))),
+            json_mode=True
+        )
+        try:
+            section_data = _load_json_object(response["content"])
+        except ValueError as e:
+            logger.warning("Error parsing section %r: %s", outline_section.get('title', ''), e)
+            return None
+        # The outline's title and overview take precedence over the section's
+        # own; anything else the outline echoes back is ignored
+        return {
+            **section_data,
+            **{key: outline_section[key] for key in _OUTLINE_SECTION_FIELDS if key in outline_section}
+        }
+
+    def _create_script_generation_prompt(self, request: "ScriptRequest") -> str:
+        """
+        Create the request-specific prompt for generating a script.
+        
+        The static instructions and response schema are sent separately in
+        the system message (see _SCRIPT_SYSTEM_PROMPT).
+        
+        Args:
+            request: The script generation request
+            
+        Returns:
+            A prompt for the LLM
         """
+        # Lazy %-formatting: the request repr is only built when debug logging is on
+        logger.debug("Creating script generation prompt for request %r", request)
+        return _build_script_generation_prompt(
+            request.topic,
+            request.target_audience,
+            request.duration_minutes,
+            request.style,
+            request.inspiration
+        )
 
-    def _parse_llm_response(self, response: str, request: ScriptRequest) -> Dict[str, Any]:
+    def _parse_llm_response(self, response: str, request: "ScriptRequest") -> Dict[str, Any]:
         """
         Parse the LLM response into a script data dictionary.
         
@@ -142,73 +1194,67 @@ class ScriptGeneratorService:
             A dictionary with script data
         """
         try:
-            # Extract JSON from the response (in case the LLM added extra text)
-            json_start = response.find('{')
-            json_end = response.rfind('}') + 1
-            if json_start == -1 or json_end == 0:
-                raise ValueError("No JSON found in response")
-            
-            json_str = response[json_start:json_end]
-            script_data = json.loads(json_str)
-            
-            # Validate the script data
-            if "title" not in script_data:
-                script_data["title"] = f"Understanding {request.topic}"
-            
-            if "description" not in script_data:
-                script_data["description"] = f"A comprehensive explanation of {request.topic} for {request.target_audience} audiences."
-            
-            if "total_duration" not in script_data:
-                # Estimate total duration based on request
-                script_data["total_duration"] = request.duration_minutes * 60
+            script_data = _load_json_object(response)
+            return self._normalize_script_data(script_data, request)
+        except (ValueError, fastjsonschema.JsonSchemaException):
+            # If parsing fails, return None and log the error with its traceback
+            logger.exception("Error parsing LLM response")
+            return None
+
+    def _normalize_script_data(self, script_data: Dict[str, Any], request: "ScriptRequest") -> Dict[str, Any]:
+        """
+        Fill in missing script fields and normalize timings and visuals.
+        
+        Args:
+            script_data: Script data decoded from the LLM response
+            request: The original request
             
-            # Set the section's total duration to 60
-            for section in script_data["sections"]:
-                section["total_duration"] = 60
-                for segment in section["segments"]:
-                    segment["start_time"] = 0
-                    segment["duration"] = 10
-                    for visual in segment["visuals"]:
-                        visual['visual_style'] = request.visual_style
-                        visual['timestamp'] = 0.0
-                        visual['duration'] = 2.0
-                        visual["visual_type"] = "image"
-                        visual['zoom_level'] = 1.0
-                        visual['position'] = 'center'
-                        visual['text_span'] = ""
-                        visual['transition'] = 'fade'
+        Returns:
+            The normalized script data
+        """
+        # Reject payloads that do not follow the requested structure
+        _validate_script_data(script_data)
+        
+        if "title" not in script_data:
+            script_data["title"] = f"Understanding {request.topic}"
+        
+        if "description" not in script_data:
+            script_data["description"] = f"A comprehensive explanation of {request.topic} for {request.target_audience} audiences."
+        
+        if "total_duration" not in script_data:
+            # Estimate total duration based on request
+            script_data["total_duration"] = request.duration_minutes * 60
+        
+        # Normalize timings and visual fields over the known
+        # sections -> segments -> visuals schema
+        for section in script_data["sections"]:
+            self._normalize_section_data(section)
+        
+        return script_data
+
+    def _normalize_section_data(self, section: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Normalize the timings and visual fields of one validated section.
+        
+        The visual style is left out, since it belongs to the request
+        rather than the generated data; _create_sections applies it.
+        
+        Args:
+            section: Section data decoded from the LLM response
             
-            # # If visual style is set, override all visual_style fields in visuals
-            # if getattr(request, 'visual_style', None):
-            #     def set_visual_style(obj):
-            #         if isinstance(obj, dict):
-            #             for k, v in obj.items():
-            #                 if k == 'visuals' and isinstance(v, list):
-            #                     for visual in v:
-            #                         if isinstance(visual, dict):
-            #                             visual['visual_style'] = request.visual_style
-            #                             visual['timestamp'] = 0.0
-            #                             visual['duration'] = 2.0
-            #                             visual["visual_type"] = "image"
-            #                             visual['zoom_level'] = 1.0
-            #                             visual['position'] = 'center'
-            #                             visual['text_span'] = ""
-            #                             visual['transition'] = 'fade'
-            #                 else:
-            #                     set_visual_style(v)
-            #         elif isinstance(obj, list):
-            #             for item in obj:
-            #                 set_visual_style(item)
-            #     set_visual_style(script_data)
-            return script_data
-        except Exception as e:
-            # If parsing fails, return None and print error with details and debug info
-            import traceback
-            print(f"Error parsing LLM response: {e}")
-            print(traceback.format_exc())
-            return None
+        Returns:
+            The normalized section data
+        """
+        section["total_duration"] = 60
+        for segment in section["segments"]:
+            segment["start_time"] = 0
+            segment["duration"] = 10
+            for visual in segment.get("visuals", ()):
+                visual.pop('visual_style', None)
+                visual.update(_NORMALIZED_VISUAL_FIELDS)
+        return section
 
-    async def regenerate_section(self, section_id: str, sections: list, inspiration: str) -> dict:
+    async def regenerate_section(self, section_id: str, sections: list, inspiration: str, prompt: str = "") -> dict:
         """
         Regenerate a single section using context from all sections and inspiration.
         Args:
@@ -229,120 +1275,88 @@ class ScriptGeneratorService:
             "\n".join([f"Segment: {seg.get('id', '')}\nNarrationText: {seg.get('narrationText', '')}" for seg in s.get("segments", [])])
             for s in other_sections
         ])
-        regen_prompt = f"""
-        You are an expert scriptwriter for educational videos. Your job is to regenerate a specific section of a script, ensuring it fits contextually with the rest of the script and is inspired by the following:
-
-        Inspiration: {inspiration}
-
-        Other Sections Context:
-        {context_str}
-
-        ---
-
-        Regenerate the following section so it fits seamlessly with the rest of the script. Be creative, ensure the style and tone match the context and inspiration, and preserve any important structure or information:
-
-        Section to Regenerate:
-        Title: {section_to_regen.get('title', '')}
-        Content: {section_to_regen.get('content', '')}
-
-        User Prompt: {prompt}
-
-        Return your result as a JSON object with the following structure:
-        {{
-            "id": "{section_id}",
-            "title": "Section title",
-            "content": "Overview of the section",
-            "total_duration": section_duration_in_seconds,
-            "segments": [
-                {{
-                    "narration_text": "Text to be narrated",
-                    "start_time": start_time_in_seconds,
-                    "duration": duration_in_seconds,
-                    "visuals": [
-                        {{
-                            "description": "Description for image generation, directly reflecting the narration text (MINIMALISTIC VISUAL).",
-                            "timestamp": timestamp_in_seconds,
-                            "duration": duration_in_seconds,
-                            "visual_type": "image|animation|diagram|text",
-                            "visual_style": "Style guidance (optional)",
-                            "position": "left|right|center|full",
-                            "text_span": "Text span for text visuals (optional)",
-                            "transition": "fade|slide|zoom|none"
-                        }}
-                    ]
-                }}
-            ]
-        }}
-        """
+        regen_prompt = _SECTION_PROMPT_TEMPLATE.format(
+            inspiration=inspiration,
+            context=context_str,
+            section_id=section_id,
+            title=section_to_regen.get('title', ''),
+            content=section_to_regen.get('content', ''),
+            prompt=prompt
+        )
+        temperature = 0.7
+        
+        # Identical regeneration requests are served from the cache
+        cache_key = _section_request_key(self.llm_provider, regen_prompt, temperature)
+        # Cache entries are shared, so callers get their own copy
+        section_data = await _get_cached_script_data(cache_key)
+        if section_data is not None:
+            return {**copy.deepcopy(section_data), "id": section_id}
+        
         response = await self.llm_provider.generate_completion(
             messages=[
-                {"role": "system", "content": "You are an expert scriptwriter for educational videos."},
+                {"role": "system", "content": _SECTION_SYSTEM_PROMPT},
                 {"role": "user", "content": regen_prompt}
             ],
-            temperature=0.7
+            temperature=temperature,
+            json_mode=True
         )
         # Parse the response as a single section
-        import json as _json
         try:
-            json_start = response["content"].find('{')
-            json_end = response["content"].rfind('}') + 1
-            section_json = response["content"][json_start:json_end]
-            section_data = _json.loads(section_json)
-            return section_data
-        except Exception as e:
-            import traceback
-            print(f"Error parsing regenerated section: {e}")
-            print(traceback.format_exc())
+            section_data = _load_json_object(response["content"])
+            await _cache_script_data(cache_key, section_data)
+            return {**copy.deepcopy(section_data), "id": section_id}
+        except ValueError:
+            logger.exception("Error parsing regenerated section")
             raise
 
-    def _create_sections(self, sections_data: List[Dict[str, Any]]) -> List[ScriptSection]:
+    def _create_sections(self, sections_data: List[Dict[str, Any]], first_number: int = 1, visual_style: Optional[str] = None) -> List["ScriptSection"]:
         """
         Create script sections from the parsed data.
         
         Args:
             sections_data: List of section data dictionaries
+            first_number: Number used in the IDs of the first section
+            visual_style: Visual style for visuals that do not set their own
             
         Returns:
             List of ScriptSection objects
         """
+        from ..models.script import ScriptSection, ScriptSegment, Visual
+        
+        # Bind lookups used in the inner loops to locals
+        visual_defaults = {**_VISUAL_DEFAULTS, "visual_style": visual_style}.items()
         sections = []
         
-        for i, section_data in enumerate(sections_data):
-            # Create segments
+        for i, section_data in enumerate(sections_data, first_number):
+            section_get = section_data.get
+            
+            # Create segments, each with its visuals
             segments = []
-            for j, segment_data in enumerate(section_data.get("segments", [])):
-                # Create visuals
-                visuals = []
-                for k, visual_data in enumerate(segment_data.get("visuals", [])):
-                    visual = Visual(
-                        id=f"visual-{i+1}-{j+1}-{k+1}",
-                        description=visual_data.get("description", ""),
-                        timestamp=visual_data.get("timestamp", 0),
-                        duration=visual_data.get("duration", 5),
-                        visual_type=visual_data.get("visual_type", "image"),
-                        visual_style=visual_data.get("visual_style"),
-                        position=visual_data.get("position", "center"),
-                        transition=visual_data.get("transition", "fade")
+            for j, segment_data in enumerate(section_get("segments", ()), 1):
+                segment_get = segment_data.get
+                visual_prefix = f"visual-{i}-{j}-"
+                visuals = [
+                    Visual(
+                        id=f"{visual_prefix}{k}",
+                        **{key: visual_data.get(key, default) for key, default in visual_defaults}
                     )
-                    visuals.append(visual)
-                
-                # Create segment
-                segment = ScriptSegment(
-                    id=f"segment-{i+1}-{j+1}",
-                    narration_text=segment_data.get("narration_text", ""),
-                    start_time=segment_data.get("start_time", 0),
-                    duration=segment_data.get("duration", 10),
+                    for k, visual_data in enumerate(segment_get("visuals", ()), 1)
+                ]
+                segments.append(ScriptSegment(
+                    id=f"segment-{i}-{j}",
+                    narration_text=segment_get("narration_text", ""),
+                    start_time=segment_get("start_time", 0),
+                    duration=segment_get("duration", 10),
                     visuals=visuals
-                )
-                segments.append(segment)
+                ))
             
             # Create section
             section = ScriptSection(
-                id=f"section-{i+1}",
-                title=section_data.get("title", f"Section {i+1}"),
-                content=section_data.get("content", ""),
+                id=f"section-{i}",
+                title=section_get("title", f"Section {i}"),
+                content=section_get("content", ""),
                 segments=segments,
-                total_duration=section_data.get("total_duration", 0)
+                total_duration=section_get("total_duration", 0)
             )
             sections.append(section)
         
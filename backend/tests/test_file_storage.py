@@ -0,0 +1,48 @@
+"""
+Tests for the file storage utilities using pytest.
+"""
+import base64
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+from backend.utils import file_storage
+
+
+@pytest.fixture(autouse=True)
+def storage_dir(tmp_path, monkeypatch):
+    """Store files in a temporary directory."""
+    monkeypatch.setattr(file_storage, "STORAGE_DIR", tmp_path)
+    return tmp_path
+
+
+def create_png_data():
+    """Create the bytes of a small PNG image."""
+    buffer = BytesIO()
+    Image.new('RGB', (32, 32), color='red').save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+def test_save_base64_image_keeps_png_bytes(storage_dir):
+    """Test that a valid PNG is written as decoded."""
+    png_data = create_png_data()
+    success, file_path = file_storage.save_base64_image(
+        "data:image/png;base64," + base64.b64encode(png_data).decode('utf-8'), 123, "test_image"
+    )
+
+    assert success
+    with open(storage_dir / file_path, "rb") as f:
+        assert f.read() == png_data
+
+
+def test_save_base64_image_rejects_truncated_png(storage_dir):
+    """Test that a truncated PNG is rejected instead of written."""
+    png_data = create_png_data()
+    success, file_path = file_storage.save_base64_image(
+        base64.b64encode(png_data[:-20]).decode('utf-8'), 123, "test_image"
+    )
+
+    assert not success
+    assert file_path is None
+    assert not [path for path in storage_dir.rglob("*") if path.is_file()]
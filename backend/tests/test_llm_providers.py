@@ -0,0 +1,36 @@
+"""
+Tests for the LLM providers using pytest.
+"""
+import asyncio
+from types import SimpleNamespace
+
+from backend.llm.openai_provider import OpenAIProvider
+
+
+class FakeCompletions:
+    """Chat completions API that streams canned content deltas."""
+
+    def __init__(self, deltas):
+        self.deltas = deltas
+
+    async def create(self, **kwargs):
+        async def stream():
+            for delta in self.deltas:
+                yield SimpleNamespace(model="test-model", choices=[SimpleNamespace(delta=SimpleNamespace(content=delta))])
+        return stream()
+
+
+def test_openai_stream_formats_content_once():
+    """Test that partial chunks carry deltas and the final chunk the full content."""
+    client = SimpleNamespace(chat=SimpleNamespace(completions=FakeCompletions([" {\"a\":", " 1}\r\n"])))
+    provider = OpenAIProvider(api_key="test-key", client=client)
+
+    async def collect():
+        return [chunk async for chunk in provider.generate_completion_stream([{"role": "user", "content": "Hi"}])]
+
+    chunks = asyncio.run(collect())
+
+    assert [chunk["content_delta"] for chunk in chunks] == [" {\"a\":", " 1}\r\n", ""]
+    assert all("content" not in chunk for chunk in chunks[:-1])
+    assert chunks[-1]["finished"] is True
+    assert chunks[-1]["content"] == "{\"a\": 1}"
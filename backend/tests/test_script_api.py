@@ -0,0 +1,53 @@
+"""
+Tests for the script API endpoints using pytest.
+"""
+import os
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# The settings module requires the image provider settings at import time
+os.environ.setdefault("IMAGE_API_PROVIDER", "google")
+os.environ.setdefault("IMAGE_API_KEY", "test-key")
+os.environ.setdefault("IMAGE_API_MODEL", "test-model")
+
+from backend.api import script as script_api
+from backend.services.script_generator import ScriptGeneratorService
+
+
+SCRIPT_JSON = '{"title": "Leaves", "description": "About leaves", "total_duration": 60, "sections": [{"title": "Intro", "content": "Overview", "segments": [{"narration_text": "Hello", "visuals": [{"description": "A leaf", "visual_style": "pixel art"}]}]}]}'
+
+
+class UnusedLLMProvider:
+    """LLM provider for routes that must not call the LLM."""
+
+    async def generate_completion(self, messages, **kwargs):
+        raise AssertionError("The LLM should not be called")
+
+
+def create_client():
+    """Create a test client for the script router without an LLM provider."""
+    app = FastAPI()
+    app.include_router(script_api.router)
+    app.dependency_overrides[script_api.get_script_generator] = lambda: ScriptGeneratorService(UnusedLLMProvider())
+    return TestClient(app)
+
+
+def test_parse_json_applies_request_visual_style():
+    """Test that pasted scripts get the visual style of the request."""
+    response = create_client().post("/api/script/parse_json", json={
+        "json_str": SCRIPT_JSON,
+        "topic": "Photosynthesis",
+        "target_audience": "students",
+        "duration_minutes": 1,
+        "style": "educational",
+        "visual_style": "watercolor",
+        "inspiration": "",
+    })
+
+    assert response.status_code == 200
+    script = response.json()["script"]
+    assert script["visual_style"] == "watercolor"
+    visual = script["sections"][0]["segments"][0]["visuals"][0]
+    assert visual["description"] == "A leaf"
+    assert visual["visual_style"] == "watercolor"
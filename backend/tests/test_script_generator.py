@@ -0,0 +1,552 @@
+"""
+Tests for the script generator service using pytest.
+"""
+import asyncio
+
+import pytest
+
+from backend.models.script import ScriptRequest
+from backend.services import script_generator as script_generator_module
+from backend.services.script_generator import (
+    ScriptGeneratorService,
+    _JsonObjectScanner,
+    _JsonSectionScanner,
+    _canonical_topic,
+    _extract_json_object,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_script_cache(tmp_path, monkeypatch):
+    """Start each test with empty script data caches."""
+    monkeypatch.setattr(script_generator_module, "_SCRIPT_DISK_CACHE_DIR", tmp_path / "scripts")
+    monkeypatch.setattr(script_generator_module, "_script_disk_cache", None)
+    disk_cache = script_generator_module._get_script_disk_cache()
+    script_generator_module._script_data_cache.clear()
+    yield disk_cache
+    script_generator_module._script_data_cache.clear()
+    disk_cache.close()
+
+
+@pytest.fixture
+def script_request():
+    """Create a script request."""
+    return ScriptRequest(
+        topic="Photosynthesis",
+        target_audience="students",
+        duration_minutes=1,
+        style="educational",
+        visual_style="flat",
+        inspiration=""
+    )
+
+
+LLM_RESPONSE = '{"title": "Leaves", "description": "About leaves", "total_duration": 60, "sections": [{"title": "Intro", "content": "Overview", "segments": [{"narration_text": "Hello", "visuals": [{"description": "A leaf"}]}]}]}'
+
+
+class FakeLLMProvider:
+    """LLM provider that records calls and returns a canned response."""
+
+    def __init__(self, content=LLM_RESPONSE):
+        self.content = content
+        self.calls = []
+        self.call_kwargs = []
+
+    async def generate_completion(self, messages, **kwargs):
+        self.calls.append(messages)
+        self.call_kwargs.append(kwargs)
+        return {"content": self.content, "role": "assistant"}
+
+    async def generate_completion_stream(self, messages, **kwargs):
+        self.calls.append(messages)
+        self.call_kwargs.append(kwargs)
+        for i in range(0, len(self.content), 16):
+            yield {"content_delta": self.content[i:i + 16], "role": "assistant", "finished": False}
+        yield {"content_delta": "", "role": "assistant", "finished": True}
+
+
+class SlowLLMProvider(FakeLLMProvider):
+    """LLM provider that yields to the event loop and tracks concurrent calls."""
+
+    def __init__(self, content=LLM_RESPONSE):
+        super().__init__(content)
+        self.active = 0
+        self.max_active = 0
+
+    async def generate_completion_stream(self, messages, **kwargs):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(0.01)
+            async for chunk in super().generate_completion_stream(messages, **kwargs):
+                yield chunk
+        finally:
+            self.active -= 1
+
+
+class OutlineLLMProvider(FakeLLMProvider):
+    """LLM provider that answers outline and section prompts separately."""
+
+    def __init__(self, outline, section):
+        super().__init__(outline)
+        self.section = section
+        self.active = 0
+        self.max_active = 0
+
+    async def generate_completion(self, messages, **kwargs):
+        if "plan the outline" in messages[0]["content"]:
+            return await super().generate_completion(messages, **kwargs)
+        self.calls.append(messages)
+        self.call_kwargs.append(kwargs)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        return {"content": self.section, "role": "assistant"}
+
+
+@pytest.fixture
+def script_generator():
+    """Create a script generator without an LLM provider."""
+    return ScriptGeneratorService(llm_provider=None)
+
+
+def test_extract_json_object_ignores_surrounding_text():
+    """Test extracting a JSON object wrapped in prose."""
+    text = 'Here is your script:\n{"title": "A"}\nHope you like it {:}'
+    assert _extract_json_object(text) == '{"title": "A"}'
+
+
+def test_extract_json_object_ignores_braces_in_strings():
+    """Test that braces inside strings do not end the object."""
+    text = '{"title": "Curly } and { braces", "nested": {"quote": "\\"}"}}'
+    assert _extract_json_object(text) == text
+
+
+def test_json_object_scanner_across_chunks():
+    """Test locating an object whose braces and strings span chunks."""
+    scanner = _JsonObjectScanner()
+    chunks = ['Sure! {"title": "a {', 'b", "n": {"x": "\\', '"}"}', '} trailing {']
+    results = [scanner.feed(chunk) for chunk in chunks]
+    assert results[:3] == [None, None, None]
+    assert results[3] == '{"title": "a {b", "n": {"x": "\\"}"}}'
+
+
+def test_json_object_scanner_escape_at_chunk_end():
+    """Test an escaped quote whose backslash ends a chunk."""
+    scanner = _JsonObjectScanner()
+    assert scanner.feed('{"a": "x\\') is None
+    assert scanner.feed('"}", "b": [1]}') == '{"a": "x\\"}", "b": [1]}'
+
+
+def test_json_section_scanner_yields_closed_sections():
+    """Test collecting each section object as soon as it closes."""
+    scanner = _JsonSectionScanner()
+    chunks = ['Sure [1]: {"title": "[x]", "sections": [{"title": "A", "segments": [{"n"', ': "}"}]}, {"title"', ': "B", "segments": []}]}', ' {"sections": [{}]}']
+    results = [scanner.feed(chunk) for chunk in chunks]
+    assert results == [[], ['{"title": "A", "segments": [{"n": "}"}]}'], ['{"title": "B", "segments": []}'], []]
+
+
+def test_extract_json_object_incomplete():
+    """Test that incomplete or missing JSON returns None."""
+    assert _extract_json_object("no json here") is None
+    assert _extract_json_object('{"title": "A"') is None
+
+
+def test_parse_llm_response(script_generator, script_request):
+    """Test parsing an LLM response into script data."""
+    response = """```json
+    {
+        "sections": [
+            {
+                "title": "Intro",
+                "content": "Overview",
+                "segments": [
+                    {"narration_text": "Hello", "visuals": [{"description": "A leaf"}]}
+                ]
+            }
+        ]
+    }
+    ```"""
+    script_data = script_generator._parse_llm_response(response, script_request)
+
+    assert script_data["title"] == "Understanding Photosynthesis"
+    assert script_data["total_duration"] == 60
+    visual = script_data["sections"][0]["segments"][0]["visuals"][0]
+    assert visual["description"] == "A leaf"
+    assert "visual_style" not in visual
+    assert visual["position"] == "center"
+
+
+def test_parse_llm_response_invalid(script_generator, script_request):
+    """Test that an unparseable response returns None."""
+    assert script_generator._parse_llm_response("not json", script_request) is None
+
+
+def test_parse_llm_response_rejects_invalid_shape(script_generator, script_request):
+    """Test that script data missing required structure returns None."""
+    missing_segments = '{"sections": [{"title": "Intro", "content": "Overview"}]}'
+    wrong_type = '{"sections": {"title": "Intro"}}'
+    assert script_generator._parse_llm_response(missing_segments, script_request) is None
+    assert script_generator._parse_llm_response(wrong_type, script_request) is None
+
+
+def test_create_sections(script_generator, script_request):
+    """Test building section models from parsed script data."""
+    response = '{"sections": [{"title": "Intro", "content": "Overview", "segments": [{"narration_text": "Hello", "visuals": [{"description": "A leaf"}, {"description": "The sun"}]}]}]}'
+    script_data = script_generator._parse_llm_response(response, script_request)
+    sections = script_generator._create_sections(script_data["sections"], visual_style="flat")
+
+    assert len(sections) == 1
+    assert sections[0].id == "section-1"
+    segment = sections[0].segments[0]
+    assert segment.id == "segment-1-1"
+    assert [v.id for v in segment.visuals] == ["visual-1-1-1", "visual-1-1-2"]
+    assert segment.visuals[1].description == "The sun"
+    assert segment.visuals[1].visual_style == "flat"
+
+
+def test_generate_script_sends_static_prompt_first(script_request):
+    """Test that the shared instructions precede the request-specific prompt."""
+    provider = FakeLLMProvider()
+    script = asyncio.run(ScriptGeneratorService(provider).generate_script(script_request))
+
+    assert script.title == "Leaves"
+    assert script.created_at == script.updated_at
+    system_message, user_message = provider.calls[0]
+    assert system_message["role"] == "system"
+    assert "Format your response as a JSON object" in system_message["content"]
+    assert "Photosynthesis" not in system_message["content"]
+    assert "Photosynthesis" in user_message["content"]
+    assert provider.call_kwargs[0]["json_mode"] is True
+
+
+def test_script_generation_prompt_includes_inspiration(script_generator, script_request):
+    """Test that the inspiration is only added to the prompt when given."""
+    prompt = script_generator._create_script_generation_prompt(script_request)
+    inspired_request = script_request.model_copy(update={"inspiration": "Fairy tales"})
+    inspired_prompt = script_generator._create_script_generation_prompt(inspired_request)
+
+    assert "**Inspiration:**" not in prompt
+    assert "**Inspiration:** Fairy tales" in inspired_prompt
+    assert script_generator._create_script_generation_prompt(inspired_request) is inspired_prompt
+
+
+def test_generate_script_reuses_cached_response(script_request):
+    """Test that an identical request is served without a second LLM call."""
+    provider = FakeLLMProvider()
+    service = ScriptGeneratorService(provider)
+    first = asyncio.run(service.generate_script(script_request))
+    second = asyncio.run(service.generate_script(script_request))
+
+    assert len(provider.calls) == 1
+    assert first.id != second.id
+    assert first.sections == second.sections
+
+    restyled_request = script_request.model_copy(update={"visual_style": "watercolor"})
+    restyled = asyncio.run(service.generate_script(restyled_request))
+    assert len(provider.calls) == 1
+    assert restyled.sections[0].segments[0].visuals[0].visual_style == "watercolor"
+    assert first.sections[0].segments[0].visuals[0].visual_style == "flat"
+
+    paraphrased_request = script_request.model_copy(update={"topic": "An introduction to photosynthesis"})
+    asyncio.run(service.generate_script(paraphrased_request))
+    assert len(provider.calls) == 1
+
+    changed_request = script_request.model_copy(update={"style": "entertaining"})
+    asyncio.run(service.generate_script(changed_request))
+    assert len(provider.calls) == 2
+
+
+def test_generate_script_single_flight(script_request):
+    """Test that concurrent identical requests share one LLM call."""
+    provider = SlowLLMProvider()
+    service = ScriptGeneratorService(provider)
+
+    async def generate_twice():
+        return await asyncio.gather(service.generate_script(script_request), service.generate_script(script_request))
+
+    scripts = asyncio.run(generate_twice())
+
+    assert len(provider.calls) == 1
+    assert [script.title for script in scripts] == ["Leaves", "Leaves"]
+
+
+def test_generate_script_without_cache(script_request):
+    """Test that use_cache=False generates a fresh script and caches it."""
+    provider = FakeLLMProvider()
+    service = ScriptGeneratorService(provider)
+    asyncio.run(service.generate_script(script_request))
+    provider.content = provider.content.replace('"Leaves"', '"Fresh leaves"')
+    fresh = asyncio.run(service.generate_script(script_request, use_cache=False))
+    cached = asyncio.run(service.generate_script(script_request))
+
+    assert len(provider.calls) == 2
+    assert fresh.title == "Fresh leaves"
+    assert cached.title == "Fresh leaves"
+
+
+def test_canonical_topic_ignores_paraphrasing():
+    """Test that paraphrased topics share a canonical form."""
+    assert _canonical_topic("Intro to Photosynthesis") == "photosynthesis"
+    assert _canonical_topic("  Introduction to photosynthesis!") == "photosynthesis"
+    assert _canonical_topic("The History of Rome") != _canonical_topic("The History of Home")
+    assert _canonical_topic("Introduction") == "introduction"
+
+
+def test_canonical_topic_keeps_language_symbols():
+    """Test that topics differing only in symbols keep distinct canonical forms."""
+    topics = ["C", "Intro to C++", "Intro to C#", "Understanding F#", "F", "Node.js"]
+
+    assert [_canonical_topic(topic) for topic in topics] == ["c", "c++", "c#", "f#", "f", "node.js"]
+    assert _canonical_topic("Introduction to C++.") == "c++"
+    assert _canonical_topic("What is Photosynthesis?") == "what is photosynthesis"
+
+
+def test_generate_script_reuses_persisted_response(script_request):
+    """Test that script data cached on disk survives losing the memory cache."""
+    provider = FakeLLMProvider()
+    service = ScriptGeneratorService(provider)
+    asyncio.run(service.generate_script(script_request))
+    script_generator_module._script_data_cache.clear()
+    script_generator_module._get_script_disk_cache().close()
+    script_generator_module._script_disk_cache = None
+    script = asyncio.run(service.generate_script(script_request))
+
+    assert len(provider.calls) == 1
+    assert script.title == "Leaves"
+
+
+def test_generate_scripts_batches_requests(script_request):
+    """Test that several requests share one LLM call and keep their order."""
+    requests = [script_request.model_copy(update={"topic": topic}) for topic in ("Leaves", "Roots")]
+    scripts = '[{"title": "Leaves", "sections": []}, {"title": "Roots", "sections": []}]'
+    provider = FakeLLMProvider(content=f"Here you go:\n{scripts}")
+    results = asyncio.run(ScriptGeneratorService(provider).generate_scripts(requests))
+
+    assert len(provider.calls) == 1
+    assert "Video 2:" in provider.calls[0][1]["content"]
+    assert [script.title for script in results] == ["Leaves", "Roots"]
+
+
+def test_generate_scripts_retries_missing_scripts(script_request):
+    """Test that a script missing from a batched response is generated alone."""
+    requests = [script_request.model_copy(update={"topic": topic}) for topic in ("Leaves", "Roots")]
+    provider = FakeLLMProvider(content='[{"title": "Leaves", "sections": []}]')
+    results = asyncio.run(ScriptGeneratorService(provider).generate_scripts(requests))
+
+    assert len(provider.calls) == 2
+    assert "Roots" in provider.calls[1][1]["content"]
+    assert "Leaves" not in provider.calls[1][1]["content"]
+    assert len(results) == 2
+
+
+def test_generate_scripts_does_not_retry_single_requests(script_request):
+    """Test that an unparseable script requested alone is not requested again."""
+    provider = FakeLLMProvider(content="not json")
+    results = asyncio.run(ScriptGeneratorService(provider).generate_scripts([script_request]))
+
+    assert results == [None]
+    assert len(provider.calls) == 1
+
+
+def test_generate_scripts_skips_unparseable_scripts(script_request):
+    """Test that a script that cannot be generated does not fail the batch."""
+    requests = [script_request.model_copy(update={"topic": topic}) for topic in ("Leaves", "Roots")]
+    provider = FakeLLMProvider(content='[{"title": "Leaves", "sections": []}, {"title": "Roots"}]')
+    provider.generate_completion_stream = FakeLLMProvider(content="not json").generate_completion_stream
+    results = asyncio.run(ScriptGeneratorService(provider).generate_scripts(requests))
+
+    assert results[0].title == "Leaves"
+    assert results[1] is None
+
+
+def test_generate_script_closes_stream_on_error(script_request):
+    """Test that the LLM stream is closed when reading it fails."""
+    closed = []
+
+    class FailingLLMProvider(FakeLLMProvider):
+        async def generate_completion_stream(self, messages, **kwargs):
+            try:
+                yield {"content_delta": '{"title": ', "role": "assistant", "finished": False}
+                yield {"role": "assistant", "finished": False}
+            finally:
+                closed.append(True)
+
+    async def generate():
+        with pytest.raises(KeyError):
+            await ScriptGeneratorService(FailingLLMProvider()).generate_script(script_request)
+        return list(closed)
+
+    assert asyncio.run(generate()) == [True]
+
+
+def test_generate_scripts_concurrent_limits_parallel_calls(script_request):
+    """Test that concurrent generation keeps order and caps parallel LLM calls."""
+    topics = ("Leaves", "Roots", "Stems", "Flowers", "Seeds")
+    requests = [script_request.model_copy(update={"topic": topic}) for topic in topics]
+    provider = SlowLLMProvider()
+    scripts = asyncio.run(ScriptGeneratorService(provider).generate_scripts_concurrent(requests, max_parallel=2))
+
+    assert len(scripts) == len(topics)
+    assert len(provider.calls) == len(topics)
+    assert provider.max_active == 2
+
+
+def test_regenerate_section_sends_static_prompt_first():
+    """Test that section regeneration keeps request details out of the system message."""
+    sections = [
+        {"id": "section-1", "title": "Intro", "content": "Overview", "segments": []},
+        {"id": "section-2", "title": "Roots", "content": "Water", "segments": []},
+    ]
+    provider = FakeLLMProvider(content='{"title": "New roots", "segments": []}')
+    service = ScriptGeneratorService(provider)
+    section = asyncio.run(service.regenerate_section("section-2", sections, "Trees", prompt="Make it shorter"))
+
+    assert section == {"id": "section-2", "title": "New roots", "segments": []}
+    system_message, user_message = provider.calls[0]
+    assert "Return your result as a JSON object" in system_message["content"]
+    assert "section-2" not in system_message["content"]
+    assert "Make it shorter" in user_message["content"]
+
+
+def test_regenerate_section_reuses_cached_response():
+    """Test that an identical regeneration request is served without a second LLM call."""
+    sections = [
+        {"id": "section-1", "title": "Intro", "content": "Overview", "segments": []},
+        {"id": "section-2", "title": "Roots", "content": "Water", "segments": []},
+    ]
+    provider = FakeLLMProvider(content='{"title": "New roots", "segments": []}')
+    service = ScriptGeneratorService(provider)
+    first = asyncio.run(service.regenerate_section("section-2", sections, "Trees", prompt="Make it shorter"))
+    script_generator_module._script_data_cache.clear()
+    second = asyncio.run(service.regenerate_section("section-2", sections, "Trees", prompt="Make it shorter"))
+    asyncio.run(service.regenerate_section("section-2", sections, "Trees", prompt="Make it longer"))
+
+    assert second == first
+    assert len(provider.calls) == 2
+
+
+def test_regenerate_section_cache_is_not_shared_with_callers():
+    """Test that mutating a regenerated section does not change later cache hits."""
+    sections = [{"id": "section-1", "title": "Intro", "content": "Overview", "segments": []}]
+    provider = FakeLLMProvider(content='{"title": "New intro", "segments": [{"narration_text": "Hello", "visuals": []}]}')
+    service = ScriptGeneratorService(provider)
+    first = asyncio.run(service.regenerate_section("section-1", sections, "Trees"))
+    first["segments"][0]["narration_text"] = "Edited"
+    second = asyncio.run(service.regenerate_section("section-1", sections, "Trees"))
+    second["segments"].clear()
+    third = asyncio.run(service.regenerate_section("section-1", sections, "Trees"))
+
+    assert len(provider.calls) == 1
+    assert third["segments"] == [{"narration_text": "Hello", "visuals": []}]
+
+
+def test_generate_script_by_sections(script_request):
+    """Test writing each outlined section with its own LLM call."""
+    outline = '{"title": "Leaves", "sections": [{"title": "Intro", "content": "Overview"}, {"title": "Light", "content": "Sunlight"}]}'
+    section = 'Here it is: {"title": "Other", "segments": [{"narration_text": "Hello", "visuals": [{"description": "A leaf"}]}]}'
+    provider = OutlineLLMProvider(outline, section)
+    script = asyncio.run(ScriptGeneratorService(provider).generate_script_by_sections(script_request))
+
+    assert len(provider.calls) == 3
+    assert [s.title for s in script.sections] == ["Intro", "Light"]
+    assert script.sections[1].segments[0].visuals[0].id == "visual-2-1-1"
+    section_prompts = [call[1]["content"] for call in provider.calls[1:]]
+    assert all("2. Light: Sunlight" in prompt for prompt in section_prompts)
+    assert "Title: Light" in section_prompts[1]
+    assert all(kwargs["json_mode"] for kwargs in provider.call_kwargs)
+    assert provider.call_kwargs[1]["max_tokens"] >= 2048
+
+
+def test_generate_scripts_by_sections_skips_unparseable_scripts(script_request):
+    """Test that a failed outline or section yields None without failing the others."""
+    requests = [script_request.model_copy(update={"topic": topic}) for topic in ("Leaves", "Roots")]
+    outline = '{"title": "Leaves", "sections": [{"title": "Intro", "content": "Overview"}]}'
+    section = '{"title": "Intro", "segments": [{"narration_text": "Hello", "visuals": []}]}'
+    provider = OutlineLLMProvider(outline, section)
+    generate_completion = provider.generate_completion
+
+    async def fail_roots_outline(messages, **kwargs):
+        if "Roots" in messages[1]["content"] and "plan the outline" in messages[0]["content"]:
+            return {"content": "not json", "role": "assistant"}
+        return await generate_completion(messages, **kwargs)
+
+    provider.generate_completion = fail_roots_outline
+    service = ScriptGeneratorService(provider)
+    results = asyncio.run(service.generate_scripts_by_sections(requests))
+    failed_section = asyncio.run(ScriptGeneratorService(OutlineLLMProvider(outline, "not json")).generate_script_by_sections(script_request))
+
+    assert results[0].sections[0].title == "Intro"
+    assert results[1] is None
+    assert failed_section is None
+
+
+def test_generate_script_by_sections_caps_section_tokens(script_request):
+    """Test that long outlined sections do not request more tokens than the cap."""
+    outline = '{"title": "Leaves", "sections": [{"title": "Intro", "content": "Overview", "total_duration": 3600}, {"title": "Light", "content": "Sunlight", "total_duration": 600}]}'
+    section = '{"title": "Intro", "segments": [{"narration_text": "Hello", "visuals": []}]}'
+    provider = OutlineLLMProvider(outline, section)
+    asyncio.run(ScriptGeneratorService(provider).generate_script_by_sections(script_request))
+
+    assert [kwargs["max_tokens"] for kwargs in provider.call_kwargs[1:]] == [8192, 4800]
+
+
+def test_generate_script_by_sections_keeps_written_segments(script_request):
+    """Test that segments echoed back in the outline do not replace the written ones."""
+    outline = '{"title": "Leaves", "sections": [{"title": "Intro", "content": "Overview", "segments": []}]}'
+    section = '{"title": "Other", "segments": [{"narration_text": "Hello", "visuals": [{"description": "A leaf"}]}]}'
+    provider = OutlineLLMProvider(outline, section)
+    script = asyncio.run(ScriptGeneratorService(provider).generate_script_by_sections(script_request))
+
+    assert script.sections[0].title == "Intro"
+    assert [segment.narration_text for segment in script.sections[0].segments] == ["Hello"]
+
+
+def test_stream_script_sections(script_request):
+    """Test yielding streamed sections and caching the complete script."""
+    response = '{"title": "Leaves", "sections": [{"title": "Intro", "segments": [{"narration_text": "Hello", "visuals": [{"description": "A leaf"}]}]}, {"title": "Light", "segments": []}]}'
+    provider = FakeLLMProvider(content=response)
+    service = ScriptGeneratorService(provider)
+
+    async def collect():
+        return [section async for section in service.stream_script_sections(script_request)]
+
+    sections = asyncio.run(collect())
+    assert [section.id for section in sections] == ["section-1", "section-2"]
+    assert sections[0].segments[0].visuals[0].visual_style == "flat"
+
+    script = asyncio.run(service.generate_script(script_request))
+    assert len(provider.calls) == 1
+    assert script.sections == sections
+
+
+def test_regenerate_section_ignores_braces_after_object():
+    """Test that trailing prose with braces does not break the parsed section."""
+    sections = [{"id": "section-1", "title": "Intro", "content": "Overview", "segments": []}]
+    provider = FakeLLMProvider(content='```json\n{"title": "New intro", "segments": []}\n```\nUse {braces} freely.')
+    section = asyncio.run(ScriptGeneratorService(provider).regenerate_section("section-1", sections, "Trees"))
+
+    assert section == {"id": "section-1", "title": "New intro", "segments": []}
+
+
+def test_generate_script_by_sections_limits_parallel_calls(script_request):
+    """Test that section calls beyond max_parallel wait for a free slot."""
+    outline = '{"sections": [' + ", ".join(f'{{"title": "S{n}"}}' for n in range(5)) + ']}'
+    provider = OutlineLLMProvider(outline, '{"segments": []}')
+    script = asyncio.run(ScriptGeneratorService(provider).generate_script_by_sections(script_request, max_parallel=2))
+
+    assert len(script.sections) == 5
+    assert provider.max_active == 2
+
+
+def test_generate_scripts_by_sections_shares_call_limit(script_request):
+    """Test that the sections of several scripts share one concurrency limit."""
+    requests = [script_request.model_copy(update={"topic": topic}) for topic in ("Leaves", "Roots")]
+    outline = '{"sections": [{"title": "One"}, {"title": "Two"}, {"title": "Three"}]}'
+    provider = OutlineLLMProvider(outline, '{"segments": []}')
+    scripts = asyncio.run(ScriptGeneratorService(provider).generate_scripts_by_sections(requests, max_parallel=2))
+
+    assert len(provider.calls) == 8
+    assert [len(script.sections) for script in scripts] == [3, 3]
+    assert provider.max_active == 2
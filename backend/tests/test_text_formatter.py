@@ -0,0 +1,25 @@
+"""
+Tests for the LLM text formatting utilities using pytest.
+"""
+from backend.utils.text_formatter import extract_code_block, strip_code_fence
+
+
+def test_extract_code_block():
+    """Test extracting the contents of a fenced code block."""
+    assert extract_code_block('```json\n[1, 2]\n```') == '[1, 2]'
+    assert extract_code_block('Here you go:\n```JSON\n{"a": 1}\n```\nEnjoy!') == '{"a": 1}'
+    assert extract_code_block('```\n00:00 Intro\n```') == '00:00 Intro'
+
+
+def test_extract_code_block_without_fences():
+    """Test that unfenced or unterminated responses are still usable."""
+    assert extract_code_block('  [1, 2]\n') == '[1, 2]'
+    assert extract_code_block('```json\n[1, 2]') == '[1, 2]'
+
+
+def test_strip_code_fence_only_removes_wrapping_fence():
+    """Test that only a fence around the whole response is removed."""
+    text = 'Learn loops:\n```python\nfor i in range(3):\n    print(i)\n```\nThen practice.'
+    assert strip_code_fence('```json\n["A", "B"]\n```\n') == '["A", "B"]'
+    assert strip_code_fence('  0:00 Intro\n') == '0:00 Intro'
+    assert strip_code_fence(text) == text
@@ -0,0 +1,81 @@
+"""
+Tests for the Visual model using pytest.
+"""
+import base64
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+from backend.database import db
+from backend.models.visual import Visual, _INSERT_SQL
+from backend.utils import file_storage
+
+
+@pytest.fixture(autouse=True)
+def visual_db(tmp_path, monkeypatch):
+    """Use a freshly initialized database and storage directory."""
+    monkeypatch.setattr(db, "DB_FILE", tmp_path / "test.db")
+    monkeypatch.setattr(file_storage, "STORAGE_DIR", tmp_path / "storage")
+    assert db.init_db()
+    return tmp_path
+
+
+def create_png_base64():
+    """Create a small PNG image encoded as base64."""
+    buffer = BytesIO()
+    Image.new('RGB', (16, 16), color='blue').save(buffer, format='PNG')
+    return base64.b64encode(buffer.getvalue()).decode('utf-8')
+
+
+def count_visuals():
+    """Count the visual rows in the database."""
+    return db.query("SELECT COUNT(*) AS count FROM visuals", one=True)["count"]
+
+
+def test_save_records_image_path(visual_db):
+    """Test that saving a new visual stores its image under the new row ID."""
+    visual = Visual(segment_id=1, description="A leaf")
+    visual.set_image_data(create_png_base64())
+
+    assert visual.save(project_id=7)
+
+    stored = Visual.get_by_id(visual.id)
+    assert stored.image_path == visual.image_path
+    assert str(visual.id) in stored.image_path
+    assert (file_storage.STORAGE_DIR / stored.image_path).is_file()
+
+
+def test_save_removes_row_when_image_fails(visual_db):
+    """Test that a new visual whose image cannot be saved leaves no row behind."""
+    visual = Visual(segment_id=1, description="A leaf")
+    visual.set_image_data(base64.b64encode(b"not an image").decode('utf-8'))
+
+    assert not visual.save(project_id=7)
+    assert visual.id is None
+    assert count_visuals() == 0
+
+
+def test_save_many_inserts_visuals_with_images(visual_db):
+    """Test that save_many assigns row IDs and records image paths."""
+    visuals = [Visual(segment_id=1, description=f"Visual {n}", position=n) for n in range(3)]
+    visuals[1].set_image_data(create_png_base64())
+
+    assert Visual.save_many(visuals, project_id=7)
+
+    ids = [visual.id for visual in visuals]
+    assert ids == sorted(ids) and len(set(ids)) == 3
+    stored = Visual.get_by_segment_id(1)
+    assert [visual.description for visual in stored] == ["Visual 0", "Visual 1", "Visual 2"]
+    assert stored[0].image_path is None
+    assert stored[1].image_path == visuals[1].image_path
+    assert (file_storage.STORAGE_DIR / stored[1].image_path).is_file()
+
+
+def test_execute_insert_many_rolls_back_on_failure(visual_db):
+    """Test that a failing row leaves none of the batch inserted."""
+    valid = Visual(segment_id=1)._insert_params()
+    invalid = (None,) + valid[1:]
+
+    assert db.execute_insert_many(_INSERT_SQL, [valid, invalid]) is None
+    assert count_visuals() == 0
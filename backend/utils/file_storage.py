@@ -140,27 +140,31 @@ def save_base64_image(base64_data: str, project_id: int, visual_id: str = None)
         # Validate the image using PIL
         img = Image.open(BytesIO(image_data))
 
-        # Convert to PNG format
+        # PNG input is written as decoded once its chunks check out;
+        # other formats are converted to PNG
+        if img.format == 'PNG':
+            img.verify()
+            return save_asset(image_data, project_id, 'image', visual_id)
+
         output = BytesIO()
         img.save(output, format='PNG')
-        png_data = output.getvalue()
 
-        # Save the image as an asset
-        return save_asset(png_data, project_id, 'image', visual_id)
+        # Save the image as an asset, writing straight from the output buffer
+        return save_asset(output.getbuffer(), project_id, 'image', visual_id)
 
     except Exception as e:
         logger.error(f"Error processing base64 image: {str(e)}")
         return False, None
 
-def load_image_as_base64(file_path: str) -> Tuple[bool, Optional[str]]:
+def load_image_bytes(file_path: str) -> Tuple[bool, Optional[bytes]]:
     """
-    Load an image from the file system and convert it to base64.
+    Load the raw bytes of an image from the file system.
 
     Args:
         file_path: Path to the image file (relative to storage directory)
 
     Returns:
-        Tuple of (success, base64_data)
+        Tuple of (success, image_data)
     """
     try:
         # Get the absolute path
@@ -170,15 +174,31 @@ def load_image_as_base64(file_path: str) -> Tuple[bool, Optional[str]]:
         with open(abs_path, "rb") as f:
             image_data = f.read()
 
-        # Convert to base64
-        base64_data = base64.b64encode(image_data).decode("utf-8")
-
-        return True, base64_data
+        return True, image_data
 
     except Exception as e:
         logger.error(f"Error loading image: {str(e)}")
         return False, None
 
+def load_image_as_base64(file_path: str) -> Tuple[bool, Optional[str]]:
+    """
+    Load an image from the file system and convert it to base64.
+
+    Args:
+        file_path: Path to the image file (relative to storage directory)
+
+    Returns:
+        Tuple of (success, base64_data)
+    """
+    success, image_data = load_image_bytes(file_path)
+    if not success:
+        return False, None
+
+    # Convert to base64
+    base64_data = base64.b64encode(image_data).decode("utf-8")
+
+    return True, base64_data
+
 def delete_file(file_path: str) -> bool:
     """
     Delete a file from the file system.
@@ -1,6 +1,14 @@
 """
 Utility functions for formatting text responses from LLMs.
 """
+import re
+
+# A markdown code block with an optional language tag (```json). The closing
+# fence may be missing when the response was cut off.
+_CODE_BLOCK_RE = re.compile(r"```[a-zA-Z]*\s*([\s\S]*?)\s*(?:```|\Z)")
+
+# A markdown code block that wraps the whole response
+_WRAPPING_CODE_BLOCK_RE = re.compile(r"```[a-zA-Z]*\s*([\s\S]*?)\s*```")
 
 def format_llm_response(text: str) -> str:
     """
@@ -25,3 +33,41 @@ def format_llm_response(text: str) -> str:
     formatted_text = formatted_text.replace('\r\n', '\n')
     
     return formatted_text
+
+
+def extract_code_block(text: str) -> str:
+    """
+    Extract the contents of the first markdown code block in an LLM response.
+    
+    Args:
+        text: The raw text from the LLM response
+        
+    Returns:
+        The code block contents, or the whole text if it has no code block,
+        without leading/trailing whitespace
+    """
+    match = _CODE_BLOCK_RE.search(text)
+    if match:
+        return match.group(1).strip()
+    return text.strip()
+
+
+def strip_code_fence(text: str) -> str:
+    """
+    Remove a markdown code fence that wraps an entire LLM response.
+    
+    Unlike extract_code_block, code blocks inside the text are kept, so
+    free-form text that quotes a code sample is returned whole.
+    
+    Args:
+        text: The raw text from the LLM response
+        
+    Returns:
+        The text without the wrapping fence, and without leading/trailing
+        whitespace
+    """
+    text = text.strip()
+    match = _WRAPPING_CODE_BLOCK_RE.fullmatch(text)
+    if match:
+        return match.group(1).strip()
+    return text